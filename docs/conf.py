@@ -47,10 +47,19 @@ html_title = 'Surfa'
 
 # search docstring and replace !class with name of the current class
 # useful for propagating correct return types in subclass functions
+# classnames are cached since many documented members share the same parent
+_classnames = {}
+
 def process_docstring(app, what, name, obj, options, lines):
-    classname = name.split('.')[-2]
-    for i in range(len(lines)):
-        lines[i] = lines[i].replace('!class', classname)
+    classname = _classnames.get(name)
+    if classname is None:
+        classname = name.rsplit('.', 2)[-2] if '.' in name else ''
+        _classnames[name] = classname
+    if not classname:
+        return
+    for i, line in enumerate(lines):
+        if '!class' in line:
+            lines[i] = line.replace('!class', classname)
 
 def setup(app):
     app.connect('autodoc-process-docstring', process_docstring)
@@ -1,10 +1,11 @@
 #!/usr/bin/env python
 
-import re
+import os
+import ast
 import pathlib
+import platform
 
 from setuptools import setup
-from setuptools import dist
 from setuptools.extension import Extension
 
 
@@ -36,8 +37,23 @@ cython_build = not base_dir.joinpath('PKG-INFO').is_file()
 
 # configure c extensions
 ext = 'pyx' if cython_build else 'c'
-ext_opts = dict(extra_compile_args=['-O3', '-std=c99'])
+compile_args = ['-O3', '-std=c99', '-flto', '-fno-plt']
+link_args = ['-flto']
+
+# architecture-specific code generation makes the built extensions unportable,
+# so it's only enabled on request for local builds
+if os.environ.get('SURFA_BUILD_NATIVE'):
+    machine = platform.machine()
+    if machine == 'x86_64':
+        compile_args.append('-march=x86-64-v3')
+    elif machine == 'aarch64':
+        compile_args.append('-mcpu=native')
+
+# note that the extensions are not built against the stable abi (py_limited_api) since
+# the numpy<2.0 headers required at build-time are incompatible with Py_LIMITED_API
+ext_opts = dict(extra_compile_args=compile_args, extra_link_args=link_args)
 extensions = [
+    Extension('surfa.core.kernels', [f'surfa/core/kernels.{ext}'], **ext_opts),
     Extension('surfa.image.interp', [f'surfa/image/interp.{ext}'], **ext_opts),
     Extension('surfa.mesh.intersection', [f'surfa/mesh/intersection.{ext}'], **ext_opts),
 ]
@@ -47,7 +63,18 @@ extensions = [
 # the pyx files, so cython is a hard requirement here
 if cython_build:
     from Cython.Build import cythonize
-    extensions = cythonize(extensions, compiler_directives={'language_level' : '3'})
+    directives = {
+        'language_level': '3',
+        'cdivision': True,
+        'initializedcheck': False,
+        'binding': False,
+        'embedsignature': False,
+        'always_allow_keywords': False,
+    }
+    # profiling hooks add per-call overhead, so only enable them on request
+    profile = bool(os.environ.get('SURFA_CYTHON_PROFILE'))
+    directives.update({'profile': profile, 'linetrace': profile})
+    extensions = cythonize(extensions, nthreads=os.cpu_count(), compiler_directives=directives, force=False)
 
 # since we interface the c stuff with numpy, it's another hard
 # requirement at build-time
@@ -57,11 +84,11 @@ include_dirs = [np.get_include()]
 # extract the current version
 init_file = base_dir.joinpath('surfa/__init__.py')
 init_text = open(init_file, 'rt').read()
-pattern = r"^__version__ = ['\"]([^'\"]*)['\"]"
-match = re.search(pattern, init_text, re.M)
-if not match:
+version = next((node.value.value for node in ast.parse(init_text).body
+                if isinstance(node, ast.Assign)
+                and any(isinstance(t, ast.Name) and t.id == '__version__' for t in node.targets)), None)
+if version is None:
     raise RuntimeError(f'Unable to find __version__ in {init_file}.')
-version = match.group(1)
 
 long_description = '''Surfa is a collection of Python utilities for medical image
 analysis and mesh-based surface processing. It provides tools that operate on 3D image
@@ -83,7 +110,7 @@ setup(
     packages=packages,
     ext_modules=extensions,
     include_dirs=include_dirs,
-    package_data={'': ['*.pyx'], '': ['*.h']},
+    package_data={'': ['*.pyx', '*.h']},
     install_requires=requirements,
     classifiers=[
         'Development Status :: 3 - Alpha',
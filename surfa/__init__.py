@@ -4,34 +4,67 @@
 
 __version__ = '0.6.1'
 
-from . import system
-
-from .core import stack
-from .core import labels
-from .core import slicing
-from .core import LabelLookup
-from .core import LabelRecoder
-
-from .transform import Affine
-from .transform import Warp
-from .transform import Space
-from .transform import ImageGeometry
-
-from .image import Volume
-from .image import Slice
-
-from .mesh import Mesh
-from .mesh import Overlay
-from .mesh import sphere
-
-from .io import load_volume
-from .io import load_slice
-from .io import load_overlay
-from .io import load_affine
-from .io import load_label_lookup
-from .io import load_mesh
-from .io import load_warp
-
-from . import vis
-from . import freesurfer
-from . import pipeline
+import importlib
+
+
+# submodules and top-level attributes are imported lazily on first access
+# to keep the cost of `import surfa` low (PEP 562)
+_submodules = {
+    'system': 'system',
+    'core': 'core',
+    'transform': 'transform',
+    'image': 'image',
+    'mesh': 'mesh',
+    'io': 'io',
+    'vis': 'vis',
+    'freesurfer': 'freesurfer',
+    'pipeline': 'pipeline',
+    'labels': 'core.labels',
+    'slicing': 'core.slicing',
+}
+
+_attributes = {
+    'stack': 'core',
+    'LabelLookup': 'core',
+    'LabelRecoder': 'core',
+
+    'Affine': 'transform',
+    'Warp': 'transform',
+    'Space': 'transform',
+    'ImageGeometry': 'transform',
+
+    'Volume': 'image',
+    'Slice': 'image',
+
+    'Mesh': 'mesh',
+    'Overlay': 'mesh',
+    'sphere': 'mesh',
+
+    'load_volume': 'io',
+    'load_slice': 'io',
+    'load_overlay': 'io',
+    'load_affine': 'io',
+    'load_affines': 'io',
+    'load_label_lookup': 'io',
+    'load_mesh': 'io',
+    'load_warp': 'io',
+}
+
+# lazily-resolved names are exported by `from surfa import *`
+__all__ = sorted(set(_submodules) | set(_attributes))
+
+
+def __getattr__(name):
+    if name in _submodules:
+        value = importlib.import_module(f'.{_submodules[name]}', __name__)
+    elif name in _attributes:
+        module = importlib.import_module(f'.{_attributes[name]}', __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules) | set(_attributes))
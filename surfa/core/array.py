@@ -1,6 +1,18 @@
+import functools
 import numpy as np
 
 
+@functools.lru_cache(maxsize=128)
+def _conformed_shape(shape, ndim):
+    """
+    Compute the shape that results from appending empty axes to `shape` until it
+    reaches `ndim` dimensions, or None if no change is needed.
+    """
+    if len(shape) >= ndim:
+        return None
+    return shape + (1,) * (ndim - len(shape))
+
+
 def conform_ndim(arr, ndim):
     """
     Conform array to a particular dimensionality by appending empty axes.
@@ -19,10 +31,9 @@ def conform_ndim(arr, ndim):
     """
     arr = np.asarray(arr)
     if arr.ndim > ndim:
-        raise ValueError(f'cannot conform array of shape {arr.shape} to {ndmi}D')
-    for _ in range(ndim - arr.ndim):
-        arr = np.expand_dims(arr, axis=-1)
-    return arr
+        raise ValueError(f'cannot conform array of shape {arr.shape} to {ndim}D')
+    shape = _conformed_shape(arr.shape, ndim)
+    return arr if shape is None else arr.reshape(shape)
 
 
 def pad_vector_length(arr, length, fill, copy=True):
@@ -47,14 +58,17 @@ def pad_vector_length(arr, length, fill, copy=True):
     """
     arr = np.asarray(arr)
     if arr.ndim != 1:
-        raise ValueError(f'array of length {len(arr)} cannot be cut to length {length}')
-    if len(arr) > length:
         raise ValueError(f'input to pad_vector_length() must be 1D, but got {arr.ndim}D array input')
-    if len(arr) != length:
-        arr = np.concatenate([arr, np.repeat(fill, length - len(arr))])
-    elif copy:
-        return arr.copy()
-    return arr
+    n = len(arr)
+    if n > length:
+        raise ValueError(f'array of length {n} cannot be cut to length {length}')
+    if n == length:
+        return arr.copy() if copy else arr
+    # fill a preallocated vector instead of concatenating a repeated fill array
+    padded = np.empty(length, dtype=np.result_type(arr.dtype, np.asarray(fill).dtype))
+    padded[:n] = arr
+    padded[n:] = fill
+    return padded
 
 
 def check_array(arr, dtype=None, ndim=None, shape=None, name=None):
@@ -3,6 +3,12 @@ import numpy as np
 
 from surfa.core.array import conform_ndim
 from surfa.core.labels import LabelLookup
+from surfa.core.kernels import native_byteorder
+from surfa.core.kernels import onehot_scatter
+from surfa.core.kernels import kernel_supported
+from surfa.core.kernels import nonzero_min
+from surfa.core.kernels import nonzero_compact
+from surfa.core.kernels import frame_argmax
 
 
 # mgz now has its intent encoded in the version number
@@ -17,8 +23,27 @@ class FramedArrayIntents:
     warpmap_inv = 4
 
 
+# ufuncs corresponding to each comparison operator
+comparison_ufuncs = {
+    '==': np.equal,
+    '!=': np.not_equal,
+    '<':  np.less,
+    '<=': np.less_equal,
+    '>':  np.greater,
+    '>=': np.greater_equal,
+}
+
+
 class FramedArray:
 
+    # whether the metadata dictionary is shared with another array and must be
+    # copied before it can be modified
+    _metadata_shared = False
+
+    # whether the metadata dictionary (or its label lookup) has been handed out to
+    # a caller, who could modify it at any time, so it can no longer be shared
+    _metadata_exposed = False
+
     def __init__(self, basedim, data, labels=None, metadata=None):
         """
         Abstract class defining an ND array with data frames and additional meta information. This is
@@ -74,7 +99,46 @@ class FramedArray:
         """
         Return a new instance of the array with updated data. Metadata is preserved.
         """
-        return self.__class__(data=data, metadata=self.metadata)
+        return self.share_metadata(self.__class__(data=data))
+
+    def share_metadata(self, other):
+        """
+        Share the metadata of this array with another array, without copying it. The
+        dictionary is copied lazily by whichever array first accesses it for modification.
+        If the dictionary has already been returned by the `metadata` or `labels` getters,
+        it might be modified through that reference, so it is copied immediately instead.
+
+        Parameters
+        ----------
+        other : FramedArray
+            Array to receive the metadata. Any entries already set on it (for example
+            by its constructor) must be identical to those of this array, otherwise
+            the metadata is merged into a copy instead.
+
+        Returns
+        -------
+        FramedArray
+            The updated `other` array.
+        """
+        own = self._metadata
+        if self._metadata_exposed:
+            other._metadata = {**copy_metadata(own), **other._metadata}
+        elif all(key in own and own[key] is value for key, value in other._metadata.items()):
+            other._metadata = own
+            other._metadata_shared = True
+            self._metadata_shared = True
+        else:
+            other._metadata = {**copy_metadata(own), **other._metadata}
+        return other
+
+    def unshare_metadata(self):
+        """
+        Make a private copy of the metadata if it is currently shared with another array.
+        """
+        if self._metadata_shared:
+            self._metadata = copy_metadata(self._metadata)
+            self._metadata_shared = False
+            self._metadata_exposed = False
 
     def copy(self):
         """
@@ -82,7 +146,23 @@ class FramedArray:
         """
         return deepcopy(self)
 
-    def zeros(self, dtype=None, frames=None, order='K'):
+    def __deepcopy__(self, memo):
+        """
+        Deep copy the object, copying the data buffer directly instead of recursing into it.
+        """
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+        for key, value in self.__dict__.items():
+            if key == '_data':
+                value = value.copy(order='K')
+            elif key in ('_metadata_shared', '_metadata_exposed'):
+                continue
+            else:
+                value = deepcopy(value, memo)
+            copied.__dict__[key] = value
+        return copied
+
+    def zeros(self, dtype=None, frames=None, order='K', fill=0):
         """
         Return a copy of the framed array with all elements set to zero.
 
@@ -97,6 +177,9 @@ class FramedArray:
             Controls the memory layout order of the result. ‘C’ means C order, ‘F’ means
             Fortran order, and ‘K’ means as close to the order the array elements appear
             in memory as possible.
+        fill : scalar or None
+            Value to initialize the elements with. If `None`, the array is left
+            uninitialized, which is faster when the caller overwrites every element.
 
         Returns
         -------
@@ -108,7 +191,15 @@ class FramedArray:
         dtype = dtype if dtype is not None else self.dtype
         if order == 'K':
             order = 'F' if self.data.flags.f_contiguous else 'C'
-        return self.new(np.zeros(shape, dtype=dtype, order=order))
+        # np.zeros uses calloc, which gets zeroed pages from the os for free on
+        # large allocations, so only fall back to an explicit fill when necessary
+        if fill is None:
+            data = np.empty(shape, dtype=dtype, order=order)
+        elif fill == 0:
+            data = np.zeros(shape, dtype=dtype, order=order)
+        else:
+            data = np.full(shape, fill, dtype=dtype, order=order)
+        return self.new(data)
 
     def __repr__(self):
         """
@@ -121,24 +212,33 @@ class FramedArray:
         """
         dict : Dictionary to store various metadata associated with the image.
         """
+        # the returned dictionary can be modified by the caller
+        self.unshare_metadata()
+        self._metadata_exposed = True
         return self._metadata
 
     @metadata.setter
     def metadata(self, value):
         """
-        Replace the metadata dictionary. Will always make a deep copy of the new dictionary.
+        Replace the metadata dictionary. Will always make a copy of the new dictionary.
         """
-        self._metadata = deepcopy(value) if value is not None else {}
+        self._metadata = copy_metadata(value) if value is not None else {}
+        self._metadata_shared = False
+        self._metadata_exposed = False
 
     @property
     def labels(self):
         """
         LabelLookup : Label-name lookup for segmentation indices.
         """
+        # the returned lookup can be modified by the caller
+        self.unshare_metadata()
+        self._metadata_exposed = True
         return self._metadata.get('labels')
 
     @labels.setter
     def labels(self, value):
+        self.unshare_metadata()
         if value is None:
             self._metadata.pop('labels', None)
         elif not isinstance(value, LabelLookup):
@@ -167,38 +267,51 @@ class FramedArray:
         the data has changed after updating, the private `_shape_changed()` hook will be called.
         """
 
-        # make sure a string (filename) isn't being provided for input data - a common mistake
-        if isinstance(value, str):
-            raise TypeError('unexpected string for `data` parameter. Expected a {basedim}D array')
+        basedim = self._basedim
+
+        # ndarrays that already have a valid framed shape (e.g. the results of numpy operations
+        # on existing framed arrays) are by far the common case and can skip the checks below
+        valid = type(value) is np.ndarray and (value.ndim == basedim or
+                (value.ndim == basedim + 1 and value.shape[-1] != 1))
 
-        # existing arrays are not copied
-        value = np.asarray(value)
+        if not valid:
 
-        # run a few sanity checks on the input data shape
-        if value.ndim < 1:
-            raise ValueError('array data cannot be set to scalar')
+            # make sure a string (filename) isn't being provided for input data - a common mistake
+            if isinstance(value, str):
+                raise TypeError(f'unexpected string for `data` parameter. Expected a {basedim}D array')
 
-        # instead of throwing an error, data with fewer dimensions than
-        # expected should be reshaped with added axes
-        if value.ndim < self._basedim:
-            value = conform_ndim(value, self._basedim)
+            # existing arrays are not copied
+            value = np.asarray(value)
+
+            # run a few sanity checks on the input data shape
+            if value.ndim < 1:
+                raise ValueError('array data cannot be set to scalar')
 
-        # single-framed arrays will always be represented by an array with
-        # dimensionality equivalent to basedim
-        if value.ndim == (self._basedim + 1) and value.shape[-1] == 1:
-            value = value.squeeze(axis=-1)
+            # instead of throwing an error, data with fewer dimensions than
+            # expected should be reshaped with added axes
+            if value.ndim < basedim:
+                value = conform_ndim(value, basedim)
 
-        # throw an error if input array has more dimensions than the framed base
-        if value.ndim > self._basedim + 1:
-            raise ValueError(f'array data cannot be set from data with {value.ndim} dims')
+            # single-framed arrays will always be represented by an array with
+            # dimensionality equivalent to basedim
+            if value.ndim == (basedim + 1) and value.shape[-1] == 1:
+                value = value.squeeze(axis=-1)
+
+            # throw an error if input array has more dimensions than the framed base
+            if value.ndim > basedim + 1:
+                raise ValueError(f'array data cannot be set from data with {value.ndim} dims')
 
         # check for shape changes, so we can update geometry if necessary
-        current = getattr(self, '_data', None)
-        shaped_changed = current is not None and current.shape[:self.basedim] != value.shape[:self.basedim]
+        current = getattr(self, '_baseshape', None)
+        shaped_changed = current is not None and current != value.shape[:basedim]
 
         # actually set the data
         setattr(self, '_data', value)
 
+        # cache the frame-dependent shape properties, which are accessed frequently
+        self._baseshape = value.shape[:basedim]
+        self._nframes = value.shape[-1] if value.ndim == basedim + 1 else 1
+
         # send signal if the underlying shape has been modified
         if shaped_changed:
             self._shape_changed()
@@ -208,14 +321,17 @@ class FramedArray:
         """
         Core data array reshaped to include the frame dimension, regardless of nframes.
         """
-        return conform_ndim(self.data, self.basedim + 1)
+        # derived on access (instead of cached) so that it's always a view of the current
+        # data buffer, even after copying or unpickling
+        data = self._data
+        return data if data.ndim > self._basedim else data[..., np.newaxis]
 
     @property
     def nframes(self):
         """
         Number of data frames.
         """
-        return self.shape[-1] if self.data.ndim == self.basedim + 1 else 1
+        return self._nframes
 
     @property
     def shape(self):
@@ -229,7 +345,7 @@ class FramedArray:
         """
         Base spatial shape of the data array (always excludes the frame dimension).
         """
-        return self.data.shape[:self.basedim]
+        return self._baseshape
 
     @property
     def size(self):
@@ -309,10 +425,9 @@ class FramedArray:
         """
         if frames:
             return self.new(self.framed_data.min(axis=-1))
-        data = self.data
         if nonzero:
-            data = data[data.nonzero()]
-        return data.min()
+            return nonzero_min(self.data)
+        return self.data.min()
 
     def max(self, frames=False):
         """
@@ -354,7 +469,7 @@ class FramedArray:
             return self.new(self.framed_data.mean(axis=-1))
         data = self.data
         if nonzero:
-            data = data[data.nonzero()]
+            data = nonzero_compact(data)
         return data.mean()
 
     def percentile(self, percentiles, method='linear', nonzero=False):
@@ -375,10 +490,11 @@ class FramedArray:
         percentile : scalar or ndarray
             Computes percentiles.
         """
-        data = self.data
+        quantiles = np.true_divide(percentiles, 100)
         if nonzero:
-            data = data[data.nonzero()]
-        return np.percentile(data, percentiles, method=method)
+            # the compacted data is a temporary, so it's safe to partition in-place
+            return np.quantile(nonzero_compact(self.data), quantiles, method=method, overwrite_input=True)
+        return np.quantile(self.data, quantiles, method=method)
 
     def clip(self, a_min, a_max):
         """
@@ -443,15 +559,30 @@ class FramedArray:
             raise ValueError('label mapping must be a 1D list')
 
         nlabels = len(mapping)
-        inttype = np.uint16 if nlabels < np.iinfo(np.uint16).max else np.uint32
-        recoder = np.zeros(max(nlabels, self.max() + 1), dtype=inttype)
+        if nlabels == 0:
+            raise ValueError('label mapping cannot be empty')
+
+        # the recoder only needs to cover the mapped labels, since any label not in the
+        # lookup is encoded in the first frame anyway, so there's no need to scan the data
+        recoder = np.zeros(mapping.max() + 1, dtype=np.intp)
         recoder[mapping] = np.arange(nlabels)
 
-        dsize = self.data.size
-        flat = np.zeros((dsize, nlabels), dtype=dtype)
-        flat[np.arange(dsize), recoder[self.data.ravel()]] = 1
-        flat.shape = (*self.baseshape, nlabels)
-        return self.new(flat)
+        # scatter the encoded frames in a single pass over the label data. the output is
+        # fortran-ordered so that each label frame is contiguous in memory, which keeps the
+        # scattered writes local and matches the layout of volumes loaded from disk
+        labels = native_byteorder(self.data).ravel(order='F')
+        flat = np.zeros((labels.size, nlabels), dtype=dtype, order='F')
+        if flat.dtype == bool:
+            onehot_scatter(labels, recoder, flat.view(np.uint8))
+        elif flat.dtype.isnative and kernel_supported(flat.dtype):
+            onehot_scatter(labels, recoder, flat)
+        else:
+            # output types without a typed kernel, like float16, use a numpy scatter
+            inrange = (labels >= 0) & (labels < len(recoder))
+            frames = np.zeros(labels.size, dtype=np.intp)
+            frames[inrange] = recoder[labels[inrange]]
+            flat[np.arange(labels.size), frames] = 1
+        return self.new(flat.reshape((*self.baseshape, nlabels), order='F'))
 
     def collapse(self, mapping=None):
         """
@@ -471,20 +602,28 @@ class FramedArray:
             raise ValueError('cannot collapse probabilities with only 1 frame')
         
         inttype = np.uint16 if self.nframes < np.iinfo(np.uint16).max else np.uint32
-        seg = np.zeros(self.baseshape, dtype=inttype)
-        np.argmax(self, axis=-1, out=seg)
+        seg = frame_argmax(self.framed_data, inttype)
 
         if mapping is not None:
             mapping = np.asarray(mapping)
             if mapping.ndim != 1:
                 raise ValueError('label mapping must be a 1D list')
-            seg = mapping[seg]
+            if len(mapping) < self.nframes:
+                raise ValueError(f'label mapping has {len(mapping)} entries, but the array has {self.nframes} frames')
+            # gather into the most compact type that can represent the mapped labels,
+            # since the default intp mapping would quadruple the size of the output.
+            # indices are validated above, so clipping avoids np.take's buffered output
+            if mapping.dtype.kind in 'iu':
+                dtype = np.result_type(np.min_scalar_type(mapping.min()), np.min_scalar_type(mapping.max()))
+                mapping = mapping.astype(dtype, copy=False)
+            seg = np.take(mapping, seg, out=np.empty_like(seg, dtype=mapping.dtype), mode='clip')
 
         return self.new(seg)
 
     # numpy array wrapping
     def __array__(self, dtype=None):
-        return self.data
+        data = self.data
+        return data if dtype is None else data.astype(dtype, copy=False)
 
     # propagate numpy indexing - return a new instance if shape is preserved
     def __getitem__(self, index_expression):
@@ -494,95 +633,173 @@ class FramedArray:
                 return self.new(indexed)
         return indexed
 
+    # operators are evaluated with ufuncs so that results preserve the memory order
+    # of the source data (e.g. fortran-ordered volumes stay fortran-ordered)
+
+    @property
+    def _order(self):
+        data = self.data
+        return 'F' if data.flags.f_contiguous and not data.flags.c_contiguous else 'K'
+
     # comparison operators
 
+    def compare(self, op, other, out=None):
+        """
+        Element-wise comparison, optionally written into a preallocated buffer. Reusing an
+        output buffer avoids allocating a new boolean array for every comparison.
+
+        Parameters
+        ----------
+        op : str
+            Comparison operator. Must be '==', '!=', '<', '<=', '>', or '>='.
+        other : scalar or array_like
+            Value to compare with.
+        out : ndarray or !class, optional
+            Boolean array, with the same shape as the data, to write the result into.
+
+        Returns
+        -------
+        arr : !class
+            Boolean comparison result, which shares the memory of `out` if provided.
+        """
+        ufunc = comparison_ufuncs.get(op)
+        if ufunc is None:
+            raise ValueError(f'unknown comparison operator \'{op}\'')
+        if out is None:
+            return self.new(ufunc(self.data, unwrap_operand(other), order=self._order))
+        out = unwrap_operand(out)
+        return self.new(ufunc(self.data, unwrap_operand(other), out=out))
+
     def __eq__(self, other):
-        return self.new(self.data == np.asarray(other))
-    
+        # the operators (unlike the ufuncs) compare incompatible types as unequal
+        return self.new(self.data == unwrap_operand(other))
+
     def __ne__(self, other):
-        return self.new(self.data != np.asarray(other))
+        return self.new(self.data != unwrap_operand(other))
 
     def __lt__(self, other):
-        return self.new(self.data < np.asarray(other))
+        return self.new(np.less(self.data, unwrap_operand(other), order=self._order))
 
     def __le__(self, other):
-        return self.new(self.data <= np.asarray(other))
+        return self.new(np.less_equal(self.data, unwrap_operand(other), order=self._order))
 
     def __gt__(self, other):
-        return self.new(self.data > np.asarray(other))
+        return self.new(np.greater(self.data, unwrap_operand(other), order=self._order))
 
     def __ge__(self, other):
-        return self.new(self.data >= np.asarray(other))
+        return self.new(np.greater_equal(self.data, unwrap_operand(other), order=self._order))
 
     # unary operators
 
     def __pos__(self):
-        return self.new(+self.data)
+        return self.new(np.positive(self.data, order=self._order))
 
     def __neg__(self):
-        return self.new(-self.data)
+        return self.new(np.negative(self.data, order=self._order))
 
     # binary operators
 
     def __and__(self, other):
-        return self.new(self.data & np.asarray(other))
+        return self.new(np.bitwise_and(self.data, unwrap_operand(other), order=self._order))
 
     def __or__(self, other):
-        return self.new(self.data | np.asarray(other))
+        return self.new(np.bitwise_or(self.data, unwrap_operand(other), order=self._order))
 
     def __add__(self, other):
-        return self.new(self.data + np.asarray(other))
+        return self.new(np.add(self.data, unwrap_operand(other), order=self._order))
 
     def __radd__(self, other):
-        return self.new(np.asarray(other) + self.data)
+        return self.new(np.add(unwrap_operand(other), self.data, order=self._order))
 
     def __sub__(self, other):
-        return self.new(self.data - np.asarray(other))
+        return self.new(np.subtract(self.data, unwrap_operand(other), order=self._order))
 
     def __rsub__(self, other):
-        return self.new(np.asarray(other) - self.data)
+        return self.new(np.subtract(unwrap_operand(other), self.data, order=self._order))
 
     def __mul__(self, other):
-        return self.new(self.data * np.asarray(other))
+        return self.new(np.multiply(self.data, unwrap_operand(other), order=self._order))
 
     def __rmul__(self, other):
-        return self.new(np.asarray(other) * self.data)
+        return self.new(np.multiply(unwrap_operand(other), self.data, order=self._order))
 
     def __truediv__(self, other):
-        return self.new(self.data / np.asarray(other))
+        return self.new(np.true_divide(self.data, unwrap_operand(other), order=self._order))
 
     def __rtruediv__(self, other):
-        return self.new(np.asarray(other) / self.data)
+        return self.new(np.true_divide(unwrap_operand(other), self.data, order=self._order))
 
     def __pow__(self, other):
-        return self.new(self.data ** np.asarray(other))
+        # the power operator is kept since numpy has fast paths for common scalar exponents
+        return self.new(self.data ** unwrap_operand(other))
 
     # assignment operators
 
     def __setitem__(self, key, value):
+        # unwrap framed arrays directly instead of going through __array__
         if isinstance(key, FramedArray):
-            key = np.asarray(key)
+            key = key._data
         if isinstance(value, FramedArray):
-            value = np.asarray(value)
-        self.data[key] = value
+            value = value._data
+        self._data[key] = value
 
     def __iadd__(self, other):
-        self.data += np.asarray(other)
+        self.data += unwrap_operand(other)
         return self
 
     def __isub__(self, other):
-        self.data -= np.asarray(other)
+        self.data -= unwrap_operand(other)
         return self
 
     def __imul__(self, other):
-        self.data *= np.asarray(other)
+        self.data *= unwrap_operand(other)
         return self
 
     def __itruediv__(self, other):
-        self.data /= np.asarray(other)
+        self.data /= unwrap_operand(other)
         return self
 
 
+def unwrap_operand(other):
+    """
+    Prepare the operand of an arithmetic or comparison operator. Python scalars and
+    arrays are returned as is, so numpy can use its scalar fast path, framed arrays are
+    unwrapped to their data buffer, and anything else is converted to an array.
+    """
+    if isinstance(other, (int, float, bool, complex, np.ndarray, np.generic)):
+        return other
+    if isinstance(other, FramedArray):
+        return other.data
+    return np.asarray(other)
+
+
+def copy_metadata(metadata):
+    """
+    Copy a metadata dictionary. Immutable values are shared, containers (lists, arrays,
+    label lookups, etc.) are copied with their own `copy()` method, and anything else
+    falls back to a deep copy.
+
+    Parameters
+    ----------
+    metadata : dict
+        Metadata dictionary to copy.
+
+    Returns
+    -------
+    dict
+        Copied metadata.
+    """
+    copied = {}
+    for key, value in metadata.items():
+        if isinstance(value, (str, bytes, int, float, complex, np.generic)) or value is None:
+            copied[key] = value
+        elif isinstance(value, (list, dict, set, np.ndarray)):
+            copied[key] = value.copy()
+        else:
+            copied[key] = deepcopy(value)
+    return copied
+
+
 def stack(arrays):
     """
     Stack multiple framed arrays along the frame axis.
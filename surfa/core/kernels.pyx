@@ -0,0 +1,415 @@
+import numpy as np
+
+cimport cython
+cimport numpy as np
+
+
+ctypedef fused labeltype:
+    cython.char
+    cython.uchar
+    cython.short
+    cython.ushort
+    cython.int
+    cython.uint
+    cython.long
+    cython.ulong
+
+
+ctypedef fused datatype:
+    cython.char
+    cython.uchar
+    cython.short
+    cython.ushort
+    cython.int
+    cython.uint
+    cython.long
+    cython.ulong
+    cython.float
+    cython.double
+
+
+ctypedef fused lookuptype:
+    cython.char
+    cython.uchar
+    cython.short
+    cython.ushort
+    cython.int
+    cython.uint
+    cython.long
+    cython.ulong
+
+
+def native_byteorder(arr):
+    """
+    Return a view (or copy, if necessary) of an array with native byte order, since the
+    typed kernels in this module can only operate on native buffers.
+    """
+    return arr if arr.dtype.isnative else arr.astype(arr.dtype.newbyteorder('='))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def onehot_scatter(const labeltype[:] labels, const Py_ssize_t[:] recoder, datatype[:, :] out):
+    """
+    Write one-hot encoded labels into a preallocated, zero-initialized buffer.
+
+    Parameters
+    ----------
+    labels : int (N,)
+        Flattened discrete label array.
+    recoder : int (L,)
+        Lookup table mapping label values to one-hot frame indices. Labels outside
+        of the table are encoded in the first frame.
+    out : (N, F)
+        Output buffer, in which the element `(i, recoder[labels[i]])` is set to 1.
+    """
+    cdef Py_ssize_t n = labels.shape[0]
+    cdef Py_ssize_t nrecoder = recoder.shape[0]
+    cdef Py_ssize_t i, label
+
+    with nogil:
+        for i in range(n):
+            label = <Py_ssize_t>labels[i]
+            if label < 0 or label >= nrecoder:
+                out[i, 0] = 1
+            else:
+                out[i, recoder[label]] = 1
+
+
+def kernel_supported(dtype):
+    """
+    Whether the typed kernels in this module can operate on a particular (native) dtype.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'iu':
+        return dtype.itemsize in (1, 2, 4, 8)
+    return dtype.kind == 'f' and dtype.itemsize in (4, 8)
+
+
+def nonzero_min(arr):
+    """
+    Compute the minimum of the nonzero elements of an array, in a single pass and
+    without allocating a masked copy.
+
+    Parameters
+    ----------
+    arr : ndarray
+        Input array.
+
+    Returns
+    -------
+    scalar
+        Minimum nonzero value.
+    """
+    arr = native_byteorder(arr).ravel(order='K')
+    if not kernel_supported(arr.dtype):
+        return arr[arr != 0].min()
+    found, value = _nonzero_min(arr)
+    if not found:
+        raise ValueError('zero-size array to reduction operation minimum which has no identity')
+    return arr.dtype.type(value)
+
+
+def nonzero_compact(arr):
+    """
+    Extract the nonzero elements of an array into a new 1D array, using a counting pass
+    followed by a fill pass instead of building an index or mask array.
+
+    Parameters
+    ----------
+    arr : ndarray
+        Input array.
+
+    Returns
+    -------
+    ndarray
+        Flattened array of nonzero elements.
+    """
+    arr = native_byteorder(arr).ravel(order='K')
+    if not kernel_supported(arr.dtype):
+        return arr[arr != 0]
+    compact = np.empty(_nonzero_count(arr), dtype=arr.dtype)
+    _nonzero_fill(arr, compact)
+    return compact
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _nonzero_min(const datatype[:] data):
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t i
+    cdef datatype v
+    cdef datatype minimum = 0
+    cdef bint found = False
+
+    with nogil:
+        for i in range(n):
+            v = data[i]
+            if v == 0:
+                continue
+            if not found or v < minimum:
+                minimum = v
+                found = True
+            # propagate NaNs like numpy does
+            if datatype is cython.float or datatype is cython.double:
+                if v != v:
+                    minimum = v
+                    break
+
+    return found, minimum
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _nonzero_count(const datatype[:] data):
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t i
+    cdef Py_ssize_t count = 0
+
+    with nogil:
+        for i in range(n):
+            if data[i] != 0:
+                count += 1
+
+    return count
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _nonzero_fill(const datatype[:] data, datatype[:] out):
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t i
+    cdef Py_ssize_t j = 0
+
+    with nogil:
+        for i in range(n):
+            if data[i] != 0:
+                out[j] = data[i]
+                j += 1
+
+
+ctypedef fused indextype:
+    cython.ushort
+    cython.uint
+
+
+def frame_argmax(arr, dtype):
+    """
+    Compute the index of the maximum value along the last (frame) axis of an array.
+
+    Parameters
+    ----------
+    arr : ndarray
+        Input array with frames stored along the last axis.
+    dtype : np.dtype
+        Output index datatype. Must be uint16 or uint32.
+
+    Returns
+    -------
+    ndarray
+        Frame indices with the base shape of the input array.
+    """
+    arr = native_byteorder(arr)
+
+    # convert types without a kernel to an equivalently-ordered type, so that we never
+    # have to allocate the intp output of np.argmax
+    if arr.dtype == bool:
+        arr = arr.view(np.uint8)
+    elif arr.dtype == np.float16:
+        arr = arr.astype(np.float32, order='K')
+    elif not kernel_supported(arr.dtype):
+        return np.argmax(arr, axis=-1).astype(dtype)
+
+    # flatten the base dimensions without copying, if the memory layout allows
+    order = 'F' if arr.flags.f_contiguous and not arr.flags.c_contiguous else 'C'
+    baseshape = arr.shape[:-1]
+    flat = arr.reshape((-1, arr.shape[-1]), order=order)
+    out = np.empty(flat.shape[0], dtype=dtype)
+
+    if order == 'F':
+        # frames are stored as contiguous planes, so iterate over them in the outer loop
+        _argmax_planes(flat, np.empty(flat.shape[0], dtype=flat.dtype), out)
+    else:
+        _argmax_rows(flat, out)
+
+    return out.reshape(baseshape, order=order)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _argmax_rows(const datatype[:, :] data, indextype[:] out):
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t nframes = data.shape[1]
+    cdef Py_ssize_t i, f
+    cdef Py_ssize_t index
+    cdef datatype v, best
+
+    with nogil:
+        for i in range(n):
+            best = data[i, 0]
+            index = 0
+            for f in range(1, nframes):
+                v = data[i, f]
+                if v > best:
+                    best = v
+                    index = f
+                # the first NaN is always the maximum, like numpy
+                if datatype is cython.float or datatype is cython.double:
+                    if v != v and best == best:
+                        best = v
+                        index = f
+            out[i] = <indextype>index
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _argmax_planes(const datatype[:, :] data, datatype[:] best, indextype[:] out):
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t nframes = data.shape[1]
+    cdef Py_ssize_t i, f
+    cdef datatype v
+
+    with nogil:
+        for i in range(n):
+            best[i] = data[i, 0]
+            out[i] = 0
+        for f in range(1, nframes):
+            for i in range(n):
+                v = data[i, f]
+                if v > best[i]:
+                    best[i] = v
+                    out[i] = <indextype>f
+                # the first NaN is always the maximum, like numpy
+                if datatype is cython.float or datatype is cython.double:
+                    if v != v and best[i] == best[i]:
+                        best[i] = v
+                        out[i] = <indextype>f
+
+
+def lookup_gather(arr, lut, out=None):
+    """
+    Map the integer elements of an array through a lookup table. Elements outside the
+    bounds of the table are mapped to zero.
+
+    Parameters
+    ----------
+    arr : ndarray
+        Input integer array.
+    lut : ndarray
+        1D integer lookup table.
+    out : ndarray, optional
+        Integer output array with the shape of the input. The lookup table type must
+        be safely castable to its type.
+
+    Returns
+    -------
+    ndarray
+        Array with the shape and memory order of the input and the dtype of the table,
+        or `out` if provided.
+    """
+    arr = native_byteorder(arr)
+    lut = native_byteorder(np.ascontiguousarray(lut))
+    if not kernel_supported(arr.dtype) or arr.dtype.kind not in 'iu' or \
+       not kernel_supported(lut.dtype) or lut.dtype.kind not in 'iu':
+        raise ValueError(f'unsupported lookup types {arr.dtype} and {lut.dtype}')
+
+    # flatten without copying, if the memory layout allows
+    order = 'F' if arr.flags.f_contiguous and not arr.flags.c_contiguous else 'C'
+    flat = arr.ravel(order=order)
+
+    if out is None:
+        gathered = np.empty(flat.shape[0], dtype=lut.dtype)
+        _lookup_gather(flat, lut, gathered)
+        return gathered.reshape(arr.shape, order=order)
+
+    if out.shape != arr.shape:
+        raise ValueError(f'output shape {out.shape} does not match input shape {arr.shape}')
+    if not np.can_cast(lut.dtype, out.dtype) or out.dtype.kind not in 'iu' or not kernel_supported(out.dtype):
+        raise ValueError(f'cannot gather lookup values of type {lut.dtype} into array of type {out.dtype}')
+
+    # write directly into the output if it can be flattened in the same order
+    lut = lut.astype(out.dtype.newbyteorder('='), copy=False)
+    if out.dtype.isnative and (out.flags.f_contiguous if order == 'F' else out.flags.c_contiguous):
+        _lookup_gather(flat, lut, out.ravel(order=order))
+    else:
+        gathered = np.empty(flat.shape[0], dtype=lut.dtype)
+        _lookup_gather(flat, lut, gathered)
+        out[...] = gathered.reshape(arr.shape, order=order)
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _lookup_gather(const labeltype[:] data, const lookuptype[:] lut, lookuptype[:] out):
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t nlut = lut.shape[0]
+    cdef Py_ssize_t i, label
+
+    with nogil:
+        for i in range(n):
+            label = <Py_ssize_t>data[i]
+            if label < 0 or label >= nlut:
+                out[i] = 0
+            else:
+                out[i] = lut[label]
+
+
+def joint_bincount(a, b, size):
+    """
+    Count the occurrences of each label in two equally-sized label arrays, as well as
+    the co-occurrences at matching elements, in a single fused pass.
+
+    Parameters
+    ----------
+    a, b : ndarray
+        Non-negative integer label arrays.
+    size : int
+        Number of bins, which must exceed the maximum label.
+
+    Returns
+    -------
+    counts_a, counts_b, inter : ndarray
+        Label counts in `a`, in `b`, and where `a == b`.
+    """
+    if a.shape != b.shape:
+        raise ValueError(f'label arrays have mismatched shapes {a.shape} and {b.shape}')
+
+    a = native_byteorder(a)
+    b = native_byteorder(b)
+    if a.dtype != b.dtype:
+        dtype = np.result_type(a, b)
+        a = a.astype(dtype, copy=False)
+        b = b.astype(dtype, copy=False)
+
+    # both arrays must be flattened in the same order, ideally without copying
+    order = 'F' if a.flags.f_contiguous and b.flags.f_contiguous else 'C'
+    a = a.ravel(order=order)
+    b = b.ravel(order=order)
+
+    if a.dtype.kind not in 'iu' or not kernel_supported(a.dtype):
+        return (np.bincount(a, minlength=size),
+                np.bincount(b, minlength=size),
+                np.bincount(a[a == b], minlength=size))
+
+    counts_a = np.zeros(size, dtype=np.intp)
+    counts_b = np.zeros(size, dtype=np.intp)
+    inter = np.zeros(size, dtype=np.intp)
+    _joint_bincount(a, b, counts_a, counts_b, inter)
+    return counts_a, counts_b, inter
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _joint_bincount(const labeltype[:] a, const labeltype[:] b,
+                    Py_ssize_t[:] counts_a, Py_ssize_t[:] counts_b, Py_ssize_t[:] inter):
+    cdef Py_ssize_t n = a.shape[0]
+    cdef Py_ssize_t i, la, lb
+
+    with nogil:
+        for i in range(n):
+            la = <Py_ssize_t>a[i]
+            lb = <Py_ssize_t>b[i]
+            counts_a[la] += 1
+            counts_b[lb] += 1
+            if la == lb:
+                inter[la] += 1
@@ -1,8 +1,88 @@
+import sys
 import collections
 import numpy as np
 import warnings
-from copy import deepcopy
 import surfa as sf
+from surfa.core.kernels import kernel_supported
+from surfa.core.kernels import joint_bincount
+from surfa.core.kernels import lookup_gather
+
+
+def nonzero_labels(a, b):
+    """
+    Find the unique nonzero labels present in either of two segmentations.
+
+    Parameters
+    ----------
+    a, b : array_like
+        Label map arrays.
+
+    Returns
+    -------
+    labels : ndarray
+        Sorted array of unique nonzero labels.
+    """
+    # find the unique labels of each array separately to avoid concatenating them
+    labels = np.union1d(np.unique(a), np.unique(b))
+    return labels[labels != 0]
+
+
+def sequence_of_labels(labels):
+    """
+    Convert an iterable of labels to an indexable sequence, preserving the label objects.
+    """
+    return labels if isinstance(labels, (np.ndarray, list, tuple)) else list(labels)
+
+
+def label_confusion(a, b, labels):
+    """
+    Compute the label volumes and overlaps between two hard segmentations in a single
+    joint pass, instead of scanning both arrays for every label.
+
+    Parameters
+    ----------
+    a, b : array_like
+        Label map arrays to compare.
+    labels : list
+        List of labels to compute the counts for.
+
+    Returns
+    -------
+    inter, counts_a, counts_b : ndarray
+        Number of voxels with each label in both segmentations, in `a`, and in `b`.
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    labels = np.asarray(labels)
+
+    # non-negative integer labels can be histogrammed directly, unless the label values
+    # are so large (relative to the number of elements) that the histograms would be
+    # mostly empty, or not even fit in memory
+    size = None
+    if a.dtype.kind in 'iub' and b.dtype.kind in 'iub' and min(a.min(initial=0), b.min(initial=0)) >= 0:
+        size = int(max(a.max(initial=0), b.max(initial=0))) + 1
+        if size > max(a.size, 65536):
+            size = None
+
+    if size is not None:
+        index = labels.astype(np.int64)
+        valid = (index == labels) & (index >= 0) & (index < size)
+    else:
+        # otherwise, histogram the indices of the unique label values. searching the
+        # sorted values avoids concatenating the arrays and the argsort that a
+        # joint np.unique(return_inverse=True) would require
+        values = np.union1d(np.unique(a), np.unique(b))
+        a = np.searchsorted(values, a)
+        b = np.searchsorted(values, b)
+        size = len(values)
+        index = np.searchsorted(values, labels)
+        valid = index < size
+        valid[valid] = values[index[valid]] == labels[valid]
+
+    index = np.where(valid, index, 0)
+    counts = joint_bincount(a, b, size)
+    counts_a, counts_b, inter = [np.where(valid, c[index], 0) for c in counts]
+    return inter, counts_a, counts_b
 
 
 def dice(a, b, labels=None):
@@ -25,20 +105,14 @@ def dice(a, b, labels=None):
         Dictionary of dice scores for each label. If a label is missing
         from both segmentations, it is not included in the result.
     """
-    if labels is None:
-        labels = np.unique(np.concatenate([a, b]))
-        labels = np.delete(labels, np.where(labels == 0))
-
-    result = {}
-    for l in labels:
-        mask1 = a == l
-        mask2 = b == l
-        top = 2.0 * np.logical_and(mask1, mask2).sum()
-        bottom = np.sum(mask1) + np.sum(mask2)
-        if bottom != 0:
-            result[l] = top / bottom
-    
-    return result
+    labels = nonzero_labels(a, b) if labels is None else sequence_of_labels(labels)
+    inter, counts_a, counts_b = label_confusion(a, b, labels)
+
+    # skip labels missing from both segmentations without visiting them
+    bottom = counts_a + counts_b
+    present = np.flatnonzero(bottom)
+    scores = 2.0 * inter[present] / bottom[present]
+    return dict(zip([labels[i] for i in present], scores))
 
 
 def jaccard(a, b, labels=None):
@@ -61,23 +135,73 @@ def jaccard(a, b, labels=None):
         Dictionary of jaccard scores for each label. If a label is missing
         from both segmentations, it is not included in the result.
     """
-    if labels is None:
-        labels = np.unique(np.concatenate([a, b]))
-        labels = np.delete(labels, np.where(labels == 0))
-    
-    result = {}
-    for l in labels:
-        mask1 = a == l
-        mask2 = b == l
-        top = np.logical_and(mask1, mask2).sum()
-        bottom = np.logical_or(mask1, mask2).sum()
-        if bottom != 0:
-            result[l] = top / bottom
-    
-    return result
+    labels = nonzero_labels(a, b) if labels is None else sequence_of_labels(labels)
+    inter, counts_a, counts_b = label_confusion(a, b, labels)
+
+    # skip labels missing from both segmentations without visiting them
+    bottom = counts_a + counts_b - inter
+    present = np.flatnonzero(bottom)
+    scores = inter[present] / bottom[present]
+    return dict(zip([labels[i] for i in present], scores))
+
+
+def compile_recoding(mapping):
+    """
+    Convert a label mapping to arrays of old and new labels.
+
+    Parameters
+    ----------
+    mapping : dict
+        Label to label mapping.
+
+    Returns
+    -------
+    old, new : ndarray
+        Source and target labels of the mapping.
+    """
+    old = np.fromiter(mapping.keys(), dtype=np.int64, count=len(mapping))
+    new = np.fromiter(mapping.values(), dtype=np.int64, count=len(mapping))
+    return old, new
 
 
-def recode(seg, recoder):
+def recode_lookup_table(old, new):
+    """
+    Build a lookup table for recoding non-negative integer labels, using the most compact
+    integer type that can represent the new labels. Unmapped labels are set to zero.
+
+    Parameters
+    ----------
+    old, new : ndarray
+        Source and target labels of the mapping.
+
+    Returns
+    -------
+    lut : ndarray or None
+        Lookup table indexed by the old labels, or None if any old label is negative
+        or the old labels are too sparse for a dense table.
+    """
+    if len(old) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    if old.min() < 0:
+        return None
+    size = old.max() + 1
+    if size > max(16 * len(old), 65536):
+        return None
+    lut = np.zeros(size, dtype=compact_label_type(new))
+    lut[old] = new
+    return lut
+
+
+def compact_label_type(labels):
+    """
+    Find the smallest integer type that can represent a set of labels, including zero.
+    """
+    if len(labels) == 0:
+        return np.dtype(np.uint8)
+    return np.result_type(np.min_scalar_type(labels.min()), np.min_scalar_type(labels.max()))
+
+
+def recode(seg, recoder, out=None):
     """
     Recode the labels of a discrete segmentation.
 
@@ -87,6 +211,9 @@ def recode(seg, recoder):
         Segmentation array to recode.
     recoder : dict or LabelRecoder
         Label to label mapping.
+    out : ndarray, optional
+        Preallocated integer array, with the shape of the segmentation, to write the
+        recoded labels to. This can be reused when recoding many segmentations.
     
     Returns
     -------
@@ -99,12 +226,35 @@ def recode(seg, recoder):
     else:
         mapping = recoder
 
-    old = np.array(list(mapping.keys()))
-    new = np.array(list(mapping.values()))
-    
-    m = np.zeros(np.max((seg.max(), old.max())) + 1, dtype=np.int64)
-    m[old] = new
-    recoded = m[seg]
+    # recoders cache their compiled mapping for repeated use
+    old, new = recoder.compile() if isinstance(recoder, LabelRecoder) else compile_recoding(mapping)
+    data = np.asarray(seg)
+
+    # labels outside of the lookup table are zeroed by the gather kernel, so the
+    # table only has to cover the mapped labels and the segmentation never has
+    # to be scanned
+    lut = None
+    if data.dtype.kind in 'iu' and kernel_supported(data.dtype):
+        lut = recoder.lookup_table() if isinstance(recoder, LabelRecoder) else recode_lookup_table(old, new)
+
+    if lut is not None:
+        recoded = lookup_gather(data, lut, out=out)
+    else:
+        # search the sorted old labels instead of indexing a table that spans the
+        # label range, which also handles negative and sparse labels
+        dtype = compact_label_type(new)
+        if out is None:
+            out = np.zeros(data.shape, dtype=dtype)
+        elif not np.can_cast(dtype, out.dtype):
+            raise ValueError(f'cannot recode labels of type {dtype} into array of type {out.dtype}')
+        else:
+            out[...] = 0
+        if len(old) > 0:
+            order = np.argsort(old)
+            index = np.minimum(np.searchsorted(old[order], data), len(old) - 1)
+            found = old[order][index] == data
+            out[found] = new[order][index[found]]
+        recoded = out
 
     if isinstance(seg, sf.core.framed.FramedArray):
         recoded = seg.new(recoded)
@@ -139,7 +289,25 @@ class LabelElement:
 
     @name.setter
     def name(self, value):
-        self._value = '' if value is None else str(value)
+        # names are interned, since the same names recur across the many copies of
+        # standard lookups, and identical names then compare by identity
+        self._value = '' if value is None else sys.intern(str(value))
+        # cache the uppercase name for case-insensitive lookup searches
+        self._upper = self._value.upper()
+
+    def copy(self):
+        """
+        Return a copy of the element. This is done directly, without the overhead of
+        deepcopy, since the element only holds a string and a color array.
+        """
+        copied = LabelElement.__new__(LabelElement)
+        copied._value = self._value
+        copied._upper = self._upper
+        copied._color = self._color.copy()
+        return copied
+
+    def __deepcopy__(self, memo):
+        return self.copy()
 
     @property
     def color(self):
@@ -151,44 +319,134 @@ class LabelElement:
     @color.setter
     def color(self, value):
         if value is None:
-            self._color = [0, 0, 0]
-        if len(value) == 3:
-            value = (*value, 1.0)
-        elif len(value) != 4:
-            raise ValueError('label color must be a 4-element RGBA array')
+            self._color = np.array([0, 0, 0, 1.0])
+            return
         color = np.array(value, dtype=np.float64)
-        color[:3] = color[:3].clip(0, 255).astype(np.uint8).astype(np.float64)
+        if color.shape == (3,):
+            color = np.append(color, 1.0)
+        elif color.shape != (4,):
+            raise ValueError('label color must be a 4-element RGBA array')
+        # truncate the rgb components to valid uchar values in place
+        rgb = color[:3]
+        np.clip(rgb, 0, 255, out=rgb)
+        np.trunc(rgb, out=rgb)
         self._color = color
 
 
+def label_element_from_pair(value):
+    """
+    Convert a (name, color) pair to a LabelElement.
+    """
+    if len(value) != 2:
+        raise ValueError(f'expected a (name, color) pair for LabelLookup element, but got {len(value)} items')
+    return LabelElement(name=value[0], color=value[1])
+
+
+# conversions of supported values to LabelLookup elements
+label_element_converters = {
+    LabelElement: LabelElement.copy,
+    str: lambda value: LabelElement(name=value),
+    tuple: label_element_from_pair,
+    list: label_element_from_pair,
+}
+
+
+def lookup_from_table(indices, names, colors):
+    """
+    Build a LabelLookup from parallel columns of label indices, names, and colors.
+
+    All colors are converted in a single pass and stored in one contiguous RGBA block,
+    so that each element color is a row view into the block instead of a separate
+    allocation.
+
+    Parameters
+    ----------
+    indices : array_like of int
+        Label indices.
+    names : sequence of str
+        Label names.
+    colors : array_like
+        Label colors as an (N, 3) RGB or (N, 4) RGBA array.
+
+    Returns
+    -------
+    LabelLookup
+    """
+    lookup = LabelLookup()
+    if len(indices) == 0:
+        return lookup
+
+    indices = np.asarray(indices, dtype=np.int64)
+    colors = np.asarray(colors, dtype=np.float64).reshape(len(indices), -1)
+    if colors.shape[1] not in (3, 4):
+        raise ValueError('label colors must be an (N, 3) RGB or (N, 4) RGBA array')
+    block = np.ones((len(indices), 4), dtype=np.float64)
+    rgb = block[:, :3]
+    np.clip(colors[:, :3], 0, 255, out=rgb)
+    np.trunc(rgb, out=rgb)
+    if colors.shape[1] == 4:
+        block[:, 3] = colors[:, 3]
+
+    setitem = super(LabelLookup, lookup).__setitem__
+    for index, name, color in zip(indices.tolist(), names, block):
+        elt = LabelElement.__new__(LabelElement)
+        elt.name = name
+        elt._color = color
+        setitem(index, elt)
+    return lookup
+
+
 class LabelLookup(collections.OrderedDict):
     """
     Dictionary storing a label lookup mapping integer indices to labels names and colors.
     """
 
     def __setitem__(self, key, value):
-        if not np.issubdtype(type(key), np.integer):
+        if type(key) is not int and not np.issubdtype(type(key), np.integer):
             raise ValueError(f'cannot convert object of type {key.__class__.__name__} to LabelLookup integer index')
-        if isinstance(value, LabelElement):
-            value = deepcopy(value)
-        elif isinstance(value, str):
-            value = LabelElement(name=value)
-        elif isinstance(value, tuple) or isinstance(value, list) and len(value) == 2:
-            value = LabelElement(name=value[0], color=value[1])
-        else:
-            raise ValueError(f'cannot convert object of type {value.__class__.__name__} to LabelLookup element')
-        return super().__setitem__(int(key), value)
+        # dispatch on the exact type first, since this is hit for every label
+        convert = label_element_converters.get(type(value))
+        if convert is None:
+            convert = next((f for t, f in label_element_converters.items() if isinstance(value, t)), None)
+            if convert is None:
+                raise ValueError(f'cannot convert object of type {value.__class__.__name__} to LabelLookup element')
+        return super().__setitem__(int(key), convert(value))
 
     def __repr__(self):
+        if not self:
+            return ''
+        # elements can be renamed in place, so column widths can't be cached
         col1 = len(str(max(self.keys()))) + 1
-        col2 = max([len(elt.name) for elt in self.values()]) + 2
+        col2 = max(map(len, (elt.name for elt in self.values()))) + 2
         lines = []
         for idx, elt in self.items():
-            rgb = elt.color[:3].astype(np.uint8).astype(str)
-            color_str = ',  '.join([str(c).rjust(3) for c in rgb]) + f',  {elt.color[-1]:.2f}'
+            r, g, b, a = elt.color
+            color_str = f'{int(r):>3},  {int(g):>3},  {int(b):>3},  {a:.2f}'
             lines.append(str(idx).ljust(col1) + elt.name.ljust(col2) + color_str)
         return '\n'.join(lines)
 
+    def copy(self):
+        """
+        Return a copy of the lookup, including copies of all elements.
+        """
+        copied = LabelLookup()
+        for key, elt in self.items():
+            # keys and elements are already validated, so skip the conversion
+            super(LabelLookup, copied).__setitem__(key, elt.copy())
+        return copied
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    @property
+    def colors(self):
+        """
+        RGBA colors of all elements, in lookup order, as an (N, 4) array.
+        """
+        if not self:
+            return np.zeros((0, 4), dtype=np.float64)
+        return np.stack([elt.color for elt in self.values()])
+
     def save(self, filename, fmt=None):
         """
         Write label lookup to file.
@@ -222,7 +480,7 @@ class LabelLookup(collections.OrderedDict):
             return next((idx for idx, elt in self.items() if name == elt.name), None)
         else:
             allcaps = name.upper()
-            return [idx for idx, elt in self.items() if allcaps in elt.name.upper()]
+            return [idx for idx, elt in self.items() if allcaps in elt._upper]
 
     def extract(self, labels):
         """
@@ -290,6 +548,63 @@ class LabelRecoder:
         """
         self.mapping = dict(mapping)
         self.target = target
+        self._compiled = None
+        self._compiled_mapping = None
+        self._lut = None
+        self._lut_compiled = False
+
+    def compile(self):
+        """
+        Convert the mapping to arrays of old and new labels, as described in
+        `compile_recoding()`. The result is cached and only recomputed when the
+        mapping changes.
+
+        Returns
+        -------
+        old, new : ndarray
+            Source and target labels of the mapping.
+        """
+        if self._compiled_mapping is None or self._compiled_mapping != self.mapping:
+            self._compiled = compile_recoding(self.mapping)
+            self._compiled_mapping = dict(self.mapping)
+            self._lut = None
+            self._lut_compiled = False
+        return self._compiled
+
+    def lookup_table(self):
+        """
+        Lookup table for recoding non-negative integer labels, as described in
+        `recode_lookup_table()`. The table is only built when first needed and is
+        cached until the mapping changes.
+
+        Returns
+        -------
+        lut : ndarray or None
+            Lookup table indexed by the old labels, or None if a table can't be used.
+        """
+        old, new = self.compile()
+        if not self._lut_compiled:
+            self._lut = recode_lookup_table(old, new)
+            self._lut_compiled = True
+        return self._lut
+
+    def __call__(self, seg, out=None):
+        """
+        Recode the labels of a discrete segmentation. See `recode()` for details.
+        """
+        return recode(seg, self, out=out)
+
+    def copy(self):
+        """
+        Return a copy of the recoder. The compiled label arrays, and the lookup table if
+        it has been built, are shared with the copy, since they are never modified in place.
+        """
+        copied = LabelRecoder(self.mapping, target=None if self.target is None else self.target.copy())
+        copied._compiled = self.compile()
+        copied._compiled_mapping = self._compiled_mapping
+        copied._lut = self._lut
+        copied._lut_compiled = self._lut_compiled
+        return copied
 
     def invert(self, target_labels=None, strict=False):
         """
@@ -341,23 +656,37 @@ class LabelRecoder:
         # re-remap the aseg labels
         >>> tissue_to_aseg = sf.labels.recode(aseg,inv_lr)
         """
-        # invert the mapping dictionary, handling many-to-1 mapping case
-        inv_mapping = {}
-        for k,v in self.mapping.items():
-            if v not in inv_mapping.keys():
-                inv_mapping[v] = [k]
-            else:
-                inv_mapping[v].append(k)
-        
-        test = [len(x) == 1 for x in inv_mapping.values()]
+        keys = np.array(list(self.mapping.keys()))
+        values = np.array(list(self.mapping.values()))
+
+        if keys.dtype.kind in 'iu' and values.dtype.kind in 'iu':
+            # group the keys by target value, sorted so that the first key of each group
+            # is the minimum, which is what many-to-1 mappings are inverted to
+            order = np.lexsort((keys, values))
+            starts = np.flatnonzero(np.diff(values[order], prepend=values[order[:1]] - 1))
+            merged = len(starts) != len(keys)
+
+            # preserve the order in which target values first appear in the mapping
+            inv_keys = values[order[starts]]
+            inv_values = keys[order[starts]]
+            if len(starts) > 0:
+                appearance = np.argsort(np.minimum.reduceat(order, starts), kind='stable')
+                inv_keys = inv_keys[appearance]
+                inv_values = inv_values[appearance]
+            inv_mapping = dict(zip(inv_keys.tolist(), inv_values.tolist()))
+        else:
+            # labels that aren't all integers can't be grouped as integer arrays without
+            # losing their values, so group them in a dictionary instead
+            groups = {}
+            for k, v in self.mapping.items():
+                groups.setdefault(v, []).append(k)
+            merged = any(len(group) > 1 for group in groups.values())
+            inv_mapping = {v: min(group) for v, group in groups.items()}
 
         # raise key error if many-to-1 and strict
-        if False in test and strict:
+        if merged and strict:
             raise KeyError('Cannot strictly invert a many-to-1 LabelRecoder')
-        elif False in test:
+        elif merged:
             warnings.warn('The label remapping is not 1-to-1, some classes will be merged.')
-        
-        [x.sort() for x in inv_mapping.values()]
-        inv_mapping = {k:v[0] for k,v in inv_mapping.items()}
 
         return LabelRecoder(inv_mapping, target_labels)
@@ -32,9 +32,10 @@ def slicing_to_coords(slicing):
     coordinates : (2, N) int
         Low and high cropping coordinate pair.
     """
-    coords = np.asarray([
-        [s.start for s in slicing],
-        [s.stop  for s in slicing]])
+    n = len(slicing)
+    coords = np.stack([
+        np.fromiter((s.start for s in slicing), dtype=np.int64, count=n),
+        np.fromiter((s.stop  for s in slicing), dtype=np.int64, count=n)])
     return coords
 
 
@@ -55,9 +56,13 @@ def coords_to_slicing(coords):
     if len(coords) != 2:
         raise ValueError('expected 2 sets of coords (start and stop) for slicing')
     coords = np.asarray(coords)
-    low = np.floor(coords.min(0)).astype(np.int64)
-    high = np.ceil(coords.max(0)).astype(np.int64)
-    return tuple([slice(a, b) for a, b in zip(low, high)])
+    low = coords.min(0)
+    high = coords.max(0)
+    # integer coordinates don't require any rounding
+    if coords.dtype.kind not in 'iu':
+        low = np.floor(low)
+        high = np.ceil(high)
+    return tuple([slice(int(a), int(b)) for a, b in zip(low, high)])
 
 
 def expand_slicing(slicing, baseshape, delta):
@@ -79,10 +84,17 @@ def expand_slicing(slicing, baseshape, delta):
     slicing : tuple of slice
         Modified cropping index.
     """
-    coords = slicing_to_coords(slicing).astype(np.float32)
-    coords[0] = np.floor(coords[0] - delta)
-    coords[1] = np.ceil(coords[1] + delta)
-    coords = np.clip(coords, 0, baseshape)
+    delta = np.asarray(delta)
+    if np.issubdtype(delta.dtype, np.integer):
+        # integer deltas don't require any rounding
+        coords = slicing_to_coords(slicing)
+        coords[0] -= delta
+        coords[1] += delta
+    else:
+        coords = slicing_to_coords(slicing).astype(np.float32)
+        np.floor(coords[0] - delta, out=coords[0], casting='unsafe')
+        np.ceil(coords[1] + delta, out=coords[1], casting='unsafe')
+    np.clip(coords, 0, baseshape, out=coords, casting='unsafe')
     return coords_to_slicing(coords)
 
 
@@ -153,41 +165,55 @@ def sane_slicing(shape, index_expression):
         Cleaned index expression.
     """
     ndim = len(shape)
-    slicing = [None] * len(shape)
-    index_expression = np.index_exp[index_expression]
-
-    def make_sane_dimension(x, length, axis):
-        if isinstance(x, slice):
-            return slice(*x.indices(length))
-        if isinstance(x, int):
-            if x < 0:
-                if x < -length:
-                    raise IndexError(f'index {x} is out of bounds for axis {axis} with size {length}')
-                x = length + x
-            elif x >= length:
-                raise IndexError(f'index {x} is out of bounds for axis {axis} with size {length}')
-            return x
+    if not isinstance(index_expression, tuple):
+        index_expression = (index_expression,)
+
+    # replace the ellipsis (or implicit trailing ellipsis) with full slices. compare
+    # by identity, since the expression might contain arrays
+    ellipses = [i for i, x in enumerate(index_expression) if x is Ellipsis]
+    if len(ellipses) > 1:
+        raise IndexError('an index can only have a single ellipsis (`...`)')
+    if ellipses:
+        left = index_expression[:ellipses[0]]
+        right = index_expression[ellipses[0] + 1:]
+    else:
+        left = index_expression
+        right = ()
+
+    npad = ndim - len(left) - len(right)
+    if npad < 0:
+        raise IndexError(f'too many indices for array: array is {ndim}-dimensional, '
+                         f'but {len(left) + len(right)} were indexed')
+    index_expression = left + (slice(None),) * npad + right
+
+    # handle in-range integers and slices inline, since this is hit for every axis of
+    # every crop, and only defer to sane_dimension() for other cases and errors
+    sane = []
+    for axis, x in enumerate(index_expression):
+        length = shape[axis]
+        t = type(x)
+        if t is slice:
+            sane.append(slice(*x.indices(length)))
+        elif t is int and -length <= x < length:
+            sane.append(x + length if x < 0 else x)
         else:
-            raise IndexError('only integers, slices (`:`), and ellipsis (`...`) are valid indices')
-
-    for i, x in enumerate(index_expression):
-
-        if x is not Ellipsis:
-            slicing[i] = make_sane_dimension(x, shape[i], i)
-            continue
+            sane.append(sane_dimension(x, length, axis))
+    return tuple(sane)
 
-        for i, x in enumerate(reversed(index_expression[i + 1:])):
-            if x is Ellipsis:
-                raise IndexError('an index can only have a single ellipsis (`...`)')
-            ni = i + 1
-            slicing[-ni] = make_sane_dimension(x, shape[-ni], ndim - i)
 
-        for i in range(ndim):
-            if slicing[i] is None:
-                slicing[i] = slice(*slice(None).indices(shape[i]))
-        break
-
-    return tuple(slicing)
+def sane_dimension(x, length, axis):
+    """
+    Convert a single slice or integer index to a clean slice with explicit bounds, or
+    a non-negative integer, for an axis of a particular length.
+    """
+    if type(x) is slice:
+        return slice(*x.indices(length))
+    if isinstance(x, int):
+        i = x + length if x < 0 else x
+        if 0 <= i < length:
+            return i
+        raise IndexError(f'index {x} is out of bounds for axis {axis} with size {length}')
+    raise IndexError('only integers, slices (`:`), and ellipsis (`...`) are valid indices')
 
 
 def slicing_parameters(index_expression):
@@ -205,15 +231,16 @@ def slicing_parameters(index_expression):
     tuple of int
         tuple of (start, stop) coordinates represented by the slicing.
     """
-    start = []
-    step = []
-    for x in index_expression:
-        if isinstance(x, slice):
-            start.append(x.start)
-            step.append(x.step)
+    n = len(index_expression)
+    start = [0] * n
+    step = [1] * n
+    for i, x in enumerate(index_expression):
+        # slice can't be subclassed, so an exact type check is sufficient
+        if type(x) is slice:
+            start[i] = x.start
+            step[i] = x.step
         elif isinstance(x, int):
-            start.append(x)
-            step.append(1)
+            start[i] = x
         else:
             raise ValueError('incompatible index expression `%s` - ensure that slicing is sane' % type(x))
     return (start, step)
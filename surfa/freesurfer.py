@@ -1,8 +1,13 @@
 import os
+import sys
+import re
+import functools
+import numpy as np
 
 from surfa.system import fatal
 from surfa.core.labels import LabelRecoder
 from surfa.core.labels import LabelLookup
+from surfa.core.labels import lookup_from_table
 from surfa.io.labels import load_label_lookup
 
 
@@ -62,6 +67,51 @@ def getfile(subpath):
     return os.path.join(home(), subpath)
 
 
+# functions whose results are cached by `cached_copies`
+cached_functions = []
+
+
+def cached_copies(func):
+    """
+    Decorator that caches the (label lookup or recoder) result of a function for each set
+    of arguments and returns a copy of the cached object on every call, so that callers
+    are free to modify it.
+    """
+    cached = functools.lru_cache(maxsize=None)(func)
+    cached_functions.append(cached)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return cached(*args, **kwargs).copy()
+
+    return wrapper
+
+
+@cached_copies
+def load_cached_label_lookup(filename):
+    """
+    Load a label lookup file, caching the result for subsequent calls.
+    """
+    return load_label_lookup(filename)
+
+
+def invalidate_caches():
+    """
+    Clear all cached label lookups and recoders, for example if the files in the
+    freesurfer home directory have changed.
+    """
+    for cached in cached_functions:
+        cached.cache_clear()
+
+
+def lookup_from_rows(rows):
+    """
+    Build a label lookup from a sequence of (index, name, color) rows.
+    """
+    indices, names, colors = zip(*rows)
+    return lookup_from_table(indices, names, colors)
+
+
 def labels():
     """
     Standard label lookup for all brain regions.
@@ -70,9 +120,90 @@ def labels():
     -------
     labels : LabelLookup
     """
-    return load_label_lookup(getfile('FreeSurferColorLUT.txt'))
-
-
+    return load_cached_label_lookup(getfile('FreeSurferColorLUT.txt'))
+
+
+destrieux_rows = (
+    (0,  'Unknown',                   (  0,   0,   0)),
+    (1,  'G_and_S_frontomargin',      ( 23, 220,  60)),
+    (2,  'G_and_S_occipital_inf',     ( 23,  60, 180)),
+    (3,  'G_and_S_paracentral',       ( 63, 100,  60)),
+    (4,  'G_and_S_subcentral',        ( 63,  20, 220)),
+    (5,  'G_and_S_transv_frontopol',  ( 13,   0, 250)),
+    (6,  'G_and_S_cingul-Ant',        ( 26,  60,   0)),
+    (7,  'G_and_S_cingul-Mid-Ant',    ( 26,  60,  75)),
+    (8,  'G_and_S_cingul-Mid-Post',   ( 26,  60, 150)),
+    (9,  'G_cingul-Post-dorsal',      ( 25,  60, 250)),
+    (10, 'G_cingul-Post-ventral',     ( 60,  25,  25)),
+    (11, 'G_cuneus',                  (180,  20,  20)),
+    (12, 'G_front_inf-Opercular',     (220,  20, 100)),
+    (13, 'G_front_inf-Orbital',       (140,  60,  60)),
+    (14, 'G_front_inf-Triangul',      (180, 220, 140)),
+    (15, 'G_front_middle',            (140, 100, 180)),
+    (16, 'G_front_sup',               (180,  20, 140)),
+    (17, 'G_Ins_lg_and_S_cent_ins',   ( 23,  10,  10)),
+    (18, 'G_insular_short',           (225, 140, 140)),
+    (19, 'G_occipital_middle',        (180,  60, 180)),
+    (20, 'G_occipital_sup',           ( 20, 220,  60)),
+    (21, 'G_oc-temp_lat-fusifor',     ( 60,  20, 140)),
+    (22, 'G_oc-temp_med-Lingual',     (220, 180, 140)),
+    (23, 'G_oc-temp_med-Parahip',     ( 65, 100,  20)),
+    (24, 'G_orbital',                 (220,  60,  20)),
+    (25, 'G_pariet_inf-Angular',      ( 20,  60, 220)),
+    (26, 'G_pariet_inf-Supramar',     (100, 100,  60)),
+    (27, 'G_parietal_sup',            (220, 180, 220)),
+    (28, 'G_postcentral',             ( 20, 180, 140)),
+    (29, 'G_precentral',              ( 60, 140, 180)),
+    (30, 'G_precuneus',               ( 25,  20, 140)),
+    (31, 'G_rectus',                  ( 20,  60, 100)),
+    (32, 'G_subcallosal',             ( 60, 220,  20)),
+    (33, 'G_temp_sup-G_T_transv',     ( 60,  60, 220)),
+    (34, 'G_temp_sup-Lateral',        (220,  60, 220)),
+    (35, 'G_temp_sup-Plan_polar',     ( 65, 220,  60)),
+    (36, 'G_temp_sup-Plan_tempo',     ( 25, 140,  20)),
+    (37, 'G_temporal_inf',            (220, 220, 100)),
+    (38, 'G_temporal_middle',         (180,  60,  60)),
+    (39, 'Lat_Fis-ant-Horizont',      ( 61,  20, 220)),
+    (40, 'Lat_Fis-ant-Vertical',      ( 61,  20,  60)),
+    (41, 'Lat_Fis-post',              ( 61,  60, 100)),
+    (42, 'Medial_wall',               ( 25,  25,  25)),
+    (43, 'Pole_occipital',            (140,  20,  60)),
+    (44, 'Pole_temporal',             (220, 180,  20)),
+    (45, 'S_calcarine',               ( 63, 180, 180)),
+    (46, 'S_central',                 (221,  20,  10)),
+    (47, 'S_cingul-Marginalis',       (221,  20, 100)),
+    (48, 'S_circular_insula_ant',     (221,  60, 140)),
+    (49, 'S_circular_insula_inf',     (221,  20, 220)),
+    (50, 'S_circular_insula_sup',     ( 61, 220, 220)),
+    (51, 'S_collat_transv_ant',       (100, 200, 200)),
+    (52, 'S_collat_transv_post',      ( 10, 200, 200)),
+    (53, 'S_front_inf',               (221, 220,  20)),
+    (54, 'S_front_middle',            (141,  20, 100)),
+    (55, 'S_front_sup',               ( 61, 220, 100)),
+    (56, 'S_interm_prim-Jensen',      (141,  60,  20)),
+    (57, 'S_intrapariet_and_P_trans', (143,  20, 220)),
+    (58, 'S_oc_middle_and_Lunatus',   (101,  60, 220)),
+    (59, 'S_oc_sup_and_transversal',  ( 21,  20, 140)),
+    (60, 'S_occipital_ant',           ( 61,  20, 180)),
+    (61, 'S_oc-temp_lat',             (221, 140,  20)),
+    (62, 'S_oc-temp_med_and_Lingual', (141, 100, 220)),
+    (63, 'S_orbital_lateral',         (221, 100,  20)),
+    (64, 'S_orbital_med-olfact',      (181, 200,  20)),
+    (65, 'S_orbital-H_Shaped',        (101,  20,  20)),
+    (66, 'S_parieto_occipital',       (101, 100, 180)),
+    (67, 'S_pericallosal',            (181, 220,  20)),
+    (68, 'S_postcentral',             ( 21, 140, 200)),
+    (69, 'S_precentral-inf-part',     ( 21,  20, 240)),
+    (70, 'S_precentral-sup-part',     ( 21,  20, 200)),
+    (71, 'S_suborbital',              ( 21,  20,  60)),
+    (72, 'S_subparietal',             (101,  60,  60)),
+    (73, 'S_temporal_inf',            ( 21, 180, 180)),
+    (74, 'S_temporal_sup',            (223, 220,  60)),
+    (75, 'S_temporal_transverse',     (221,  60,  60)),
+)
+
+
+@cached_copies
 def destrieux():
     """
     Label lookup for Destrieux cortical atlas parcellations.
@@ -81,86 +212,50 @@ def destrieux():
     -------
     labels : LabelLookup
     """
-    labels = LabelLookup()
-    labels[0]  = ('Unknown',                   [  0,   0,   0])
-    labels[1]  = ('G_and_S_frontomargin',      [ 23, 220,  60])
-    labels[2]  = ('G_and_S_occipital_inf',     [ 23,  60, 180])
-    labels[3]  = ('G_and_S_paracentral',       [ 63, 100,  60])
-    labels[4]  = ('G_and_S_subcentral',        [ 63,  20, 220])
-    labels[5]  = ('G_and_S_transv_frontopol',  [ 13,   0, 250])
-    labels[6]  = ('G_and_S_cingul-Ant',        [ 26,  60,   0])
-    labels[7]  = ('G_and_S_cingul-Mid-Ant',    [ 26,  60,  75])
-    labels[8]  = ('G_and_S_cingul-Mid-Post',   [ 26,  60, 150])
-    labels[9]  = ('G_cingul-Post-dorsal',      [ 25,  60, 250])
-    labels[10] = ('G_cingul-Post-ventral',     [ 60,  25,  25])
-    labels[11] = ('G_cuneus',                  [180,  20,  20])
-    labels[12] = ('G_front_inf-Opercular',     [220,  20, 100])
-    labels[13] = ('G_front_inf-Orbital',       [140,  60,  60])
-    labels[14] = ('G_front_inf-Triangul',      [180, 220, 140])
-    labels[15] = ('G_front_middle',            [140, 100, 180])
-    labels[16] = ('G_front_sup',               [180,  20, 140])
-    labels[17] = ('G_Ins_lg_and_S_cent_ins',   [ 23,  10,  10])
-    labels[18] = ('G_insular_short',           [225, 140, 140])
-    labels[19] = ('G_occipital_middle',        [180,  60, 180])
-    labels[20] = ('G_occipital_sup',           [ 20, 220,  60])
-    labels[21] = ('G_oc-temp_lat-fusifor',     [ 60,  20, 140])
-    labels[22] = ('G_oc-temp_med-Lingual',     [220, 180, 140])
-    labels[23] = ('G_oc-temp_med-Parahip',     [ 65, 100,  20])
-    labels[24] = ('G_orbital',                 [220,  60,  20])
-    labels[25] = ('G_pariet_inf-Angular',      [ 20,  60, 220])
-    labels[26] = ('G_pariet_inf-Supramar',     [100, 100,  60])
-    labels[27] = ('G_parietal_sup',            [220, 180, 220])
-    labels[28] = ('G_postcentral',             [ 20, 180, 140])
-    labels[29] = ('G_precentral',              [ 60, 140, 180])
-    labels[30] = ('G_precuneus',               [ 25,  20, 140])
-    labels[31] = ('G_rectus',                  [ 20,  60, 100])
-    labels[32] = ('G_subcallosal',             [ 60, 220,  20])
-    labels[33] = ('G_temp_sup-G_T_transv',     [ 60,  60, 220])
-    labels[34] = ('G_temp_sup-Lateral',        [220,  60, 220])
-    labels[35] = ('G_temp_sup-Plan_polar',     [ 65, 220,  60])
-    labels[36] = ('G_temp_sup-Plan_tempo',     [ 25, 140,  20])
-    labels[37] = ('G_temporal_inf',            [220, 220, 100])
-    labels[38] = ('G_temporal_middle',         [180,  60,  60])
-    labels[39] = ('Lat_Fis-ant-Horizont',      [ 61,  20, 220])
-    labels[40] = ('Lat_Fis-ant-Vertical',      [ 61,  20,  60])
-    labels[41] = ('Lat_Fis-post',              [ 61,  60, 100])
-    labels[42] = ('Medial_wall',               [ 25,  25,  25])
-    labels[43] = ('Pole_occipital',            [140,  20,  60])
-    labels[44] = ('Pole_temporal',             [220, 180,  20])
-    labels[45] = ('S_calcarine',               [ 63, 180, 180])
-    labels[46] = ('S_central',                 [221,  20,  10])
-    labels[47] = ('S_cingul-Marginalis',       [221,  20, 100])
-    labels[48] = ('S_circular_insula_ant',     [221,  60, 140])
-    labels[49] = ('S_circular_insula_inf',     [221,  20, 220])
-    labels[50] = ('S_circular_insula_sup',     [ 61, 220, 220])
-    labels[51] = ('S_collat_transv_ant',       [100, 200, 200])
-    labels[52] = ('S_collat_transv_post',      [ 10, 200, 200])
-    labels[53] = ('S_front_inf',               [221, 220,  20])
-    labels[54] = ('S_front_middle',            [141,  20, 100])
-    labels[55] = ('S_front_sup',               [ 61, 220, 100])
-    labels[56] = ('S_interm_prim-Jensen',      [141,  60,  20])
-    labels[57] = ('S_intrapariet_and_P_trans', [143,  20, 220])
-    labels[58] = ('S_oc_middle_and_Lunatus',   [101,  60, 220])
-    labels[59] = ('S_oc_sup_and_transversal',  [ 21,  20, 140])
-    labels[60] = ('S_occipital_ant',           [ 61,  20, 180])
-    labels[61] = ('S_oc-temp_lat',             [221, 140,  20])
-    labels[62] = ('S_oc-temp_med_and_Lingual', [141, 100, 220])
-    labels[63] = ('S_orbital_lateral',         [221, 100,  20])
-    labels[64] = ('S_orbital_med-olfact',      [181, 200,  20])
-    labels[65] = ('S_orbital-H_Shaped',        [101,  20,  20])
-    labels[66] = ('S_parieto_occipital',       [101, 100, 180])
-    labels[67] = ('S_pericallosal',            [181, 220,  20])
-    labels[68] = ('S_postcentral',             [ 21, 140, 200])
-    labels[69] = ('S_precentral-inf-part',     [ 21,  20, 240])
-    labels[70] = ('S_precentral-sup-part',     [ 21,  20, 200])
-    labels[71] = ('S_suborbital',              [ 21,  20,  60])
-    labels[72] = ('S_subparietal',             [101,  60,  60])
-    labels[73] = ('S_temporal_inf',            [ 21, 180, 180])
-    labels[74] = ('S_temporal_sup',            [223, 220,  60])
-    labels[75] = ('S_temporal_transverse',     [221,  60,  60])
-    return labels
-
-
+    return lookup_from_rows(destrieux_rows)
+
+
+dkt_rows = (
+    (0,  'unknown',                  ( 25,   5,  25)),
+    (1,  'bankssts',                 ( 25, 100,  40)),
+    (2,  'caudalanteriorcingulate',  (125, 100, 160)),
+    (3,  'caudalmiddlefrontal',      (100,  25,   0)),
+    (4,  'corpuscallosum',           (120,  70,  50)),
+    (5,  'cuneus',                   (220,  20, 100)),
+    (6,  'entorhinal',               (220,  20,  10)),
+    (7,  'fusiform',                 (180, 220, 140)),
+    (8,  'inferiorparietal',         (220,  60, 220)),
+    (9,  'inferiortemporal',         (180,  40, 120)),
+    (10, 'isthmuscingulate',         (140,  20, 140)),
+    (11, 'lateraloccipital',         ( 20,  30, 140)),
+    (12, 'lateralorbitofrontal',     ( 35,  75,  50)),
+    (13, 'lingual',                  (225, 140, 140)),
+    (14, 'medialorbitofrontal',      (200,  35,  75)),
+    (15, 'middletemporal',           (160, 100,  50)),
+    (16, 'parahippocampal',          ( 20, 220,  60)),
+    (17, 'paracentral',              ( 60, 220,  60)),
+    (18, 'parsopercularis',          (220, 180, 140)),
+    (19, 'parsorbitalis',            ( 20, 100,  50)),
+    (20, 'parstriangularis',         (220,  60,  20)),
+    (21, 'pericalcarine',            (120, 100,  60)),
+    (22, 'postcentral',              (220,  20,  20)),
+    (23, 'posteriorcingulate',       (220, 180, 220)),
+    (24, 'precentral',               ( 60,  20, 220)),
+    (25, 'precuneus',                (160, 140, 180)),
+    (26, 'rostralanteriorcingulate', ( 80,  20, 140)),
+    (27, 'rostralmiddlefrontal',     ( 75,  50, 125)),
+    (28, 'superiorfrontal',          ( 20, 220, 160)),
+    (29, 'superiorparietal',         ( 20, 180, 140)),
+    (30, 'superiortemporal',         (140, 220, 220)),
+    (31, 'supramarginal',            ( 80, 160,  20)),
+    (32, 'frontalpole',              (100,   0, 100)),
+    (33, 'temporalpole',             ( 70,  20, 170)),
+    (34, 'transversetemporal',       (150, 150, 200)),
+    (35, 'insula',                   (255, 192,  32)),
+)
+
+
+@cached_copies
 def dkt():
     """
     Label lookup for DKT cortical atlas parcellations.
@@ -169,46 +264,21 @@ def dkt():
     -------
     labels : LabelLookup
     """
-    labels = LabelLookup()
-    labels[0]  = ('unknown',                  [ 25,   5,  25])
-    labels[1]  = ('bankssts',                 [ 25, 100,  40])
-    labels[2]  = ('caudalanteriorcingulate',  [125, 100, 160])
-    labels[3]  = ('caudalmiddlefrontal',      [100,  25,   0])
-    labels[4]  = ('corpuscallosum',           [120,  70,  50])
-    labels[5]  = ('cuneus',                   [220,  20, 100])
-    labels[6]  = ('entorhinal',               [220,  20,  10])
-    labels[7]  = ('fusiform',                 [180, 220, 140])
-    labels[8]  = ('inferiorparietal',         [220,  60, 220])
-    labels[9]  = ('inferiortemporal',         [180,  40, 120])
-    labels[10] = ('isthmuscingulate',         [140,  20, 140])
-    labels[11] = ('lateraloccipital',         [ 20,  30, 140])
-    labels[12] = ('lateralorbitofrontal',     [ 35,  75,  50])
-    labels[13] = ('lingual',                  [225, 140, 140])
-    labels[14] = ('medialorbitofrontal',      [200,  35,  75])
-    labels[15] = ('middletemporal',           [160, 100,  50])
-    labels[16] = ('parahippocampal',          [ 20, 220,  60])
-    labels[17] = ('paracentral',              [ 60, 220,  60])
-    labels[18] = ('parsopercularis',          [220, 180, 140])
-    labels[19] = ('parsorbitalis',            [ 20, 100,  50])
-    labels[20] = ('parstriangularis',         [220,  60,  20])
-    labels[21] = ('pericalcarine',            [120, 100,  60])
-    labels[22] = ('postcentral',              [220,  20,  20])
-    labels[23] = ('posteriorcingulate',       [220, 180, 220])
-    labels[24] = ('precentral',               [ 60,  20, 220])
-    labels[25] = ('precuneus',                [160, 140, 180])
-    labels[26] = ('rostralanteriorcingulate', [ 80,  20, 140])
-    labels[27] = ('rostralmiddlefrontal',     [ 75,  50, 125])
-    labels[28] = ('superiorfrontal',          [ 20, 220, 160])
-    labels[29] = ('superiorparietal',         [ 20, 180, 140])
-    labels[30] = ('superiortemporal',         [140, 220, 220])
-    labels[31] = ('supramarginal',            [ 80, 160,  20])
-    labels[32] = ('frontalpole',              [100,   0, 100])
-    labels[33] = ('temporalpole',             [ 70,  20, 170])
-    labels[34] = ('transversetemporal',       [150, 150, 200])
-    labels[35] = ('insula',                   [255, 192,  32])
-    return labels
+    return lookup_from_rows(dkt_rows)
+
 
+tissue_type_rows = (
+    (0, 'Unknown',                 (0,   0,   0)),
+    (1, 'Cortex',                  (205, 62,  78)),
+    (2, 'Subcortical-Gray-Matter', (230, 148, 34)),
+    (3, 'White-Matter',            (245, 245, 245)),
+    (4, 'CSF',                     (120, 18,  134)),
+    (5, 'Head',                    (150, 150, 200)),
+    (6, 'Lesion',                  (255, 165,  0)),
+)
 
+
+@cached_copies
 def tissue_types():
     """
     Label lookup for generic brain tissue types (including skull and head labels).
@@ -217,15 +287,73 @@ def tissue_types():
     -------
     labels : LabelLookup
     """
-    labels = LabelLookup()
-    labels[0] = ('Unknown',                  [0,   0,   0])
-    labels[1] = ('Cortex',                   [205, 62,  78])
-    labels[2] = ('Subcortical-Gray-Matter',  [230, 148, 34])
-    labels[3] = ('White-Matter',             [245, 245, 245])
-    labels[4] = ('CSF',                      [120, 18,  134])
-    labels[5] = ('Head',                     [150, 150, 200])
-    labels[6] = ('Lesion',                   [255, 165,  0])
-    return labels
+    return lookup_from_rows(tissue_type_rows)
+
+
+# target labels included in `nonlateral_aseg_recoder`
+nonlateral_include_names = frozenset({
+    "Unknown",
+    "Left-Cerebral-White-Matter",
+    "Left-Cerebral-Cortex",
+    "Left-Cerebellum-White-Matter",
+    "Left-Cerebellum-Cortex",
+    "Left-Thalamus",
+    "Left-Caudate",
+    "Left-Putamen",
+    "Left-Pallidum",
+    "3rd-Ventricle",
+    "4th-Ventricle",
+    "Brain-Stem",
+    "Left-Hippocampus",
+    "Left-Amygdala",
+    "CSF",
+    "Left-Lesion",
+    "Left-Accumbens-area",
+    "Left-VentralDC",
+    "Left-Choroid-Plexus",
+})
+
+
+# label index ranges (split by the upper bounds) used to classify source labels in
+# `nonlateral_aseg_recoder`, and their target names. None indicates that the target
+# is derived from the source label name, and False indicates that labels are excluded
+nonlateral_range_edges = np.array([100, 250, 256, 1000, 3000, 5000, 7000, 7021, 8000, 9000, 11001, 13000, 15000])
+nonlateral_range_names = (
+    None,                          # < 100: aseg labels
+    False,
+    'Left-Cerebral-White-Matter',  # 250-255: corpus callosum
+    False,
+    'Left-Cerebral-Cortex',        # 1000-2999: cortical parcellations
+    'Left-Cerebral-White-Matter',  # 3000-4999: white matter parcellations
+    False,
+    'Left-Amygdala',               # 7000-7020: amygdala nuclei
+    False,
+    'Left-Thalamus',               # 8000-8999: thalamic nuclei
+    False,
+    'Left-Cerebral-Cortex',        # 11001-12999: destrieux labels
+    'Left-Cerebral-White-Matter',  # 13000-14999: destrieux white matter
+    False,
+)
+nonlateral_range_included = np.array([name is not False for name in nonlateral_range_names])
+
+
+# matches hypointensity, lesion, and wmsa aseg label names
+lesion_name_pattern = re.compile('ypoint|esion|wmsa')
+
+
+@functools.lru_cache(maxsize=None)
+def nonlateral_aseg_name(name):
+    """
+    Convert an aseg label name to its nonlateral target name, in which right-hemisphere
+    labels are merged with the left, ventricles with CSF, and hypointensities with lesions.
+    """
+    if name.startswith('Right-'):
+        name = name.replace('Right-', 'Left-')
+    if 'Vent' in name and 'entral' not in name:
+        name = 'CSF'
+    if lesion_name_pattern.search(name):
+        name = 'Left-Lesion'
+    return sys.intern(name)
 
 
 def nonlateral_aseg_recoder(include_lesions=False):
@@ -236,66 +364,33 @@ def nonlateral_aseg_recoder(include_lesions=False):
     Returns:
         RecodingLookupTable: .
     """
-    include_list = [
-        "Unknown",
-        "Left-Cerebral-White-Matter",
-        "Left-Cerebral-Cortex",
-        "Left-Cerebellum-White-Matter",           
-        "Left-Cerebellum-Cortex",
-        "Left-Thalamus",
-        "Left-Caudate",
-        "Left-Putamen",
-        "Left-Pallidum",
-        "3rd-Ventricle",                           
-        "4th-Ventricle",
-        "Brain-Stem",                            
-        "Left-Hippocampus",
-        "Left-Amygdala",                        
-        "CSF",
-        "Left-Lesion",
-        "Left-Accumbens-area",
-        "Left-VentralDC",
-        "Left-Choroid-Plexus"
-    ]        
-    aseg = labels()
     source_lut = labels()
     target_lut = LabelLookup()
+    target_keys = {}
     mapping = {}
-    for key in source_lut.keys():
-        if (key >= 1000 and key < 3000) or \
-           (key > 11000 and key < 13000):   # destrieux labels
-            name = 'Left-Cerebral-Cortex'
-        elif (key >= 3000 and key < 5000) or (key >= 13000 and key < 15000) or (key >= 250 and key <= 255):
-            name = 'Left-Cerebral-White-Matter'
-        elif (key >= 7000 and key <= 7020):
-            name = 'Left-Amygdala'
-        elif (key >= 8000 and key < 9000):
-            name = 'Left-Thalamus'
-        elif key < 100:
-            name = source_lut[key].name
-            if name.startswith('Right-'):
-                name = name.replace('Right-', 'Left-')
-            if (name.find('Vent') >= 0 and name.find('entral') < 0):
-                name = 'CSF'
-            if name.find('ypoint') >= 0 or name.find('esion') >= 0 or \
-               name.find('wmsa') >= 0:
-                name = 'Left-Lesion'
-        else:
-            continue
 
-        if name not in include_list:
-            continue
+    # classify all label indices by range in a single pass, and drop excluded labels
+    # before looping over the remaining ones
+    keys = np.fromiter(source_lut.keys(), dtype=np.int64, count=len(source_lut))
+    ranges = np.searchsorted(nonlateral_range_edges, keys, side='right')
+    included = nonlateral_range_included[ranges]
 
-        source_key = key
-        target_list = target_lut.search(name)
+    for key, r in zip(keys[included].tolist(), ranges[included].tolist()):
+        name = nonlateral_range_names[r]
+        if name is None:
+            name = nonlateral_aseg_name(source_lut[key].name)
+
+        if name not in nonlateral_include_names:
+            continue
 
-        if len(target_list) == 0:  # not already
+        # track target labels by name instead of searching the growing target lookup
+        target_key = target_keys.get(name)
+        if target_key is None:  # not already
             target_key = len(target_lut)
             target_lut[target_key] = (name, source_lut[key].color)
-        else:
-            target_key = target_list[0]
+            target_keys[name] = target_key
 
-        mapping[source_key] = target_key
+        mapping[key] = target_key
 
     return LabelRecoder(mapping, target=target_lut)
 
@@ -316,6 +411,17 @@ def tissue_type_recoder(extra=False, lesions=False):
     -------
     recoder : LabelRecoder
     """
+    # normalize the options so that each of the four variants is only built once,
+    # regardless of how it was requested
+    return tissue_type_recoder_variant(bool(extra), bool(lesions))
+
+
+@cached_copies
+def tissue_type_recoder_variant(extra, lesions):
+    """
+    Build the tissue-type recoder for a particular combination of (boolean) options.
+    Use `tissue_type_recoder()` instead of calling this directly.
+    """
     mapping = {
         0:    0,  # Unknown
         2:    3,  # Left-Cerebral-White-Matter
@@ -585,8 +691,8 @@ def reduced35_aseg_recoder():
 		2034: 21,
 		2035: 21
     }
-    target_lut_path = os.path.join(os.environ.get('FREESURFER_HOME'),'luts/ReducedLabels35.txt')
-    target = load_label_lookup(target_lut_path)
+    target_lut_path = getfile('luts/ReducedLabels35.txt')
+    target = load_cached_label_lookup(target_lut_path)
     return LabelRecoder(mapping, target=target)
 
 def reduced24_aseg_recoder():
@@ -728,8 +834,8 @@ def reduced24_aseg_recoder():
 		2035: 15
     }
 
-    target_lut_path = os.path.join(os.environ.get('FREESURFER_HOME'),'luts/ReducedLabels24.txt')
-    target = load_label_lookup(target_lut_path)
+    target_lut_path = getfile('luts/ReducedLabels24.txt')
+    target = load_cached_label_lookup(target_lut_path)
 
     return LabelRecoder(mapping, target=target)
 
@@ -781,11 +887,12 @@ def reduced24_reduced35_recoder():
 		35: 24,
 		77: 0
     }
-    target_lut_path = os.path.join(os.environ.get('FREESURFER_HOME'), 'luts/ReducedLabels24.txt')
-    target = load_label_lookup(target_lut_path)
+    target_lut_path = getfile('luts/ReducedLabels24.txt')
+    target = load_cached_label_lookup(target_lut_path)
 
     return LabelRecoder(mapping, target=target)
 
+@cached_copies
 def tissue_type_reduced35_recoder():
     """
     Return a recoding lookup that converts the ReducedLabels35 labels to the
@@ -837,6 +944,7 @@ def tissue_type_reduced35_recoder():
     
     return LabelRecoder(mapping, target=tissue_types())
 
+@cached_copies
 def tissue_type_reduced24_recoder():
     """
     Return a recoding lookup that converts the ReducedLabels24 labels to the
@@ -55,7 +55,7 @@ class FramedImage(FramedArray):
         preserved unless specified.
         """
         geometry = geometry if geometry is not None else self.geom
-        return self.__class__(data=data, geometry=geometry, metadata=self.metadata)
+        return self.share_metadata(self.__class__(data=data, geometry=geometry))
 
     @property
     def geom(self):
@@ -106,7 +106,9 @@ class FramedImage(FramedArray):
             sigma = pad_vector_length(sigma, self.basedim + 1, 0, copy=False)
         # make sure to account for the voxel size of the image, since sigma is in mm units
         sigma = np.asarray(sigma) / (*self.geom.voxsize, 1)
-        return self.new(gaussian_filter(self.framed_data, sigma))
+        # filter into a buffer that preserves the memory order of the source data
+        data = self.framed_data
+        return self.new(gaussian_filter(data, sigma, output=np.empty_like(data)))
 
     def __getitem__(self, index_expression):
         """
@@ -141,12 +143,13 @@ class FramedImage(FramedArray):
         except IndexError:
             return self.data[index_expression]
 
-        # extract the starting coordinate of the cropping
+        # extract the starting coordinate of the cropping. these are short vectors, so
+        # work with plain lists to avoid allocating small arrays
         start, step = slicing_parameters(sane_expression)
-        start = pad_vector_length(start, 3, 0)
-        step = pad_vector_length(step, 3, 1)
+        start = start + [0] * (3 - len(start))
+        step = step + [1] * (3 - len(step))
 
-        if np.any(step < 1):
+        if any(s < 1 for s in step):
             raise NotImplementedError('axes cannot be flipped via cropping, use reorient() instead')
 
         # use the original index_expression to crop the raw array
@@ -157,8 +160,8 @@ class FramedImage(FramedArray):
         voxsize = self.geom.voxsize * step
 
         # determine if any axes are to be removed (e.g. in 3D to 2D cropping cases)
-        cut_axes = [isinstance(x, int) for x in sane_expression]
-        num_axis_cuts = np.count_nonzero(cut_axes)
+        cut_indices = [i for i, x in enumerate(sane_expression) if isinstance(x, int)]
+        num_axis_cuts = len(cut_indices)
         if (self.basedim == 2 and num_axis_cuts > 0) or (self.basedim == 3 and num_axis_cuts > 1):
             # if the array will have axes removed making it less than 2D, let's just
             # return the cropped ndarray directly, since the result is no longer an
@@ -171,8 +174,10 @@ class FramedImage(FramedArray):
             # framed image, but we'll need to update the geometry information appropriately
             # to account for the change in voxel orientation
             cropped_basedim = 2
-            cut_index = cut_axes.index(True)
-            inter_baseshape = np.insert(cropped_data.shape, cut_index, 1)[:self.basedim]
+            cut_index = cut_indices[0]
+            inter_baseshape = list(cropped_data.shape)
+            inter_baseshape.insert(cut_index, 1)
+            inter_baseshape = inter_baseshape[:self.basedim]
             if cut_index < 2:
                 axis_swap = [1, 2, 0] if cut_index == 0 else [0, 2, 1]
                 rotation = rotation[:, axis_swap]
@@ -181,14 +186,14 @@ class FramedImage(FramedArray):
             # if a dimension is not removed, then we don't need to do much except update
             # the geometry shape and world center coordinate
             cropped_basedim = self.basedim
-            inter_baseshape = np.asarray(cropped_data.shape[:self.basedim])
-
-        # compute the new geometry
-        inter_baseshape = pad_vector_length(inter_baseshape, 3, 1)
-        matrix = self.geom.vox2world.matrix.copy()
-        matrix[:3, 3] = self.geom.vox2world.transform(start)
-        image_center = np.append(inter_baseshape * step / 2, 1)
-        world_center = np.matmul(matrix, image_center)[:3]
+            inter_baseshape = list(cropped_data.shape[:self.basedim])
+
+        # compute the new geometry, in which the world center is the center of the
+        # cropped region, transformed as a single point with the raw vox2world matrix
+        inter_baseshape += [1] * (3 - len(inter_baseshape))
+        matrix = self.geom.vox2world.matrix
+        image_center = [a + s * t / 2 for a, s, t in zip(start, inter_baseshape, step)]
+        world_center = matrix[:3, :3] @ image_center + matrix[:3, 3]
         geometry = ImageGeometry(
             shape=cropped_data.shape[:cropped_basedim],
             center=world_center,
@@ -198,7 +203,7 @@ class FramedImage(FramedArray):
 
         # construct cropped volume (might be Slice or Volume depending on final dimensionality)
         itype = Slice if cropped_basedim == 2 else Volume
-        cropped = itype(cropped_data, geometry=geometry, metadata=self.metadata)
+        cropped = self.share_metadata(itype(cropped_data, geometry=geometry))
         return cropped
 
     def bbox(self, margin=None):
@@ -281,31 +286,32 @@ class FramedImage(FramedArray):
             raise NotImplementedError('resize() is not yet implemented for 2D data, '
                                       'contact andrew if you need this')
 
-        if np.isscalar(voxsize):
-            # deal with a scalar voxel size input
-            voxsize = np.repeat(voxsize, 3).astype('float')
-        else:
-            # pad to ensure array has length of 3
-            voxsize = np.asarray(voxsize, dtype='float')
-            check_array(voxsize, ndim=1, shape=3, name='voxsize')
-            voxsize = pad_vector_length(voxsize, 3, 1, copy=False)
-
         # check if anything needs to be done
-        if np.allclose(self.geom.voxsize, voxsize, atol=1e-5, rtol=0):
+        geom = self.geom
+        target_geom = resized_geometry(geom, voxsize)
+        if target_geom is None:
             return self.copy() if copy else self
+        target_shape = target_geom.shape
+
+        # multiply the matrices directly, since the voxel-to-voxel affine is only
+        # needed as an array for interpolation
+        affine = np.matmul(geom.world2vox.matrix, target_geom.vox2world.matrix)
+
+        # when downsampling by integer factors with nearest-neighbor interpolation, the
+        # target voxels often fall exactly on source voxels, in which case the result
+        # is just a strided slicing of the source data
+        if method == 'nearest':
+            steps = np.rint(np.diag(affine)[:3])
+            starts = np.rint(affine[:3, 3])
+            stops = starts + steps * (np.asarray(target_shape) - 1)
+            if np.allclose(affine[:3, :3], np.diag(steps), atol=1e-5, rtol=0) and \
+               np.allclose(affine[:3, 3], starts, atol=1e-5, rtol=0) and \
+               np.all(steps >= 1) and np.all(starts >= 0) and np.all(stops < self.baseshape):
+                slicing = tuple([slice(int(a), int(b) + 1, int(c)) for a, b, c in zip(starts, stops, steps)])
+                return self.new(self.framed_data[slicing].copy(order='K'), target_geom)
 
-        baseshape3D = pad_vector_length(self.baseshape, 3, 1, copy=False)
-        target_shape = np.asarray(self.geom.voxsize, dtype='float') * baseshape3D / voxsize
-        target_shape = tuple(np.ceil(target_shape).astype(int))
-
-        target_geom = ImageGeometry(
-            shape=target_shape,
-            voxsize=voxsize,
-            rotation=self.geom.rotation,
-            center=self.geom.center)
-        affine = self.geom.world2vox @ target_geom.vox2world
         interped = interpolate(source=self.framed_data, target_shape=target_shape,
-                               method=method, affine=affine.matrix)
+                               method=method, affine=affine)
         return self.new(interped, target_geom)
 
     def resample_like(self, target, method='linear', copy=True, fill=0):
@@ -337,8 +343,8 @@ class FramedImage(FramedArray):
         if image_geometry_equal(source_geom, target_geom):
             return self.copy() if copy else self
 
-        # compute the voxel-to-voxel affine
-        affine = self.geom.world2vox @ target_geom.vox2world
+        # compute the voxel-to-voxel affine directly as a matrix
+        affine = np.matmul(source_geom.world2vox.matrix, target_geom.vox2world.matrix)
 
         # this is an optimization to avoid interpolation if it's not needed:
         # commonly, such as when conforming images for preprocessing, images are cropped
@@ -352,8 +358,10 @@ class FramedImage(FramedArray):
         if np.allclose(source_geom.voxsize,  target_geom.voxsize,  atol=1e-5, rtol=0.0) and \
            np.allclose(source_geom.rotation, target_geom.rotation, atol=1e-5, rtol=0.0) and \
            np.allclose(source_geom.shear,    target_geom.shear,    atol=1e-5, rtol=0.0):
-            # now check if there is a integer-difference between source and target coordinates
-            coord = affine.inv().transform((0, 0, 0))
+            # now check if there is a integer-difference between source and target coordinates.
+            # the target coordinate of the source origin is just the translation of the inverse
+            # affine, which can be composed from the cached inverse geometry transforms
+            coord = np.matmul(target_geom.world2vox.matrix, source_geom.vox2world.matrix)[:3, 3]
             coord_rounded = coord.round()
             if np.allclose(coord, coord_rounded, atol=1e-5, rtol=0.0):
                 # compute the slicing coordinates defining the matching grid regions
@@ -381,7 +389,7 @@ class FramedImage(FramedArray):
 
         # otherwise just do the standard interpolation with the computed affine
         interped = interpolate(source=self.framed_data, target_shape=target_geom.shape,
-                               method=method, affine=affine.matrix, fill=fill)
+                               method=method, affine=affine, fill=fill)
         return self.new(interped, target_geom)
 
     def transform(self, trf=None, method='linear', rotation='corner', resample=True, fill=0):
@@ -462,56 +470,15 @@ class FramedImage(FramedArray):
             raise NotImplementedError('reorient() is not yet implemented for 2D data, '
                                       'contact andrew if you need this')
 
-        trg_orientation = orientation.upper()
-        src_orientation = otn.rotation_matrix_to_orientation(self.geom.vox2world.matrix)
-        if trg_orientation == src_orientation.upper():
+        reorientation = reoriented_geometry(self.geom, orientation)
+        if reorientation is None:
             return self.copy() if copy else self
+        axes, flips, target_geom = reorientation
 
-        # extract world axes
-        get_world_axes = lambda aff: np.argmax(np.absolute(np.linalg.inv(aff)), axis=0)
-        trg_matrix = otn.orientation_to_rotation_matrix(trg_orientation)
-        src_matrix = otn.orientation_to_rotation_matrix(src_orientation)
-        world_axes_trg = get_world_axes(trg_matrix[:self.basedim, :self.basedim])
-        world_axes_src = get_world_axes(src_matrix[:self.basedim, :self.basedim])
-
-        voxsize = np.asarray(self.geom.voxsize)
-        voxsize_swapped = np.ones(self.basedim)
-        for i in range(self.basedim):
-            c1 = trg_orientation[i]
-            for j in range(self.basedim):
-                c2 = src_orientation[j]
-                if ((c1 in 'RL' and c2 in 'RL') or
-                    (c1 in 'AP' and c2 in 'AP') or
-                    (c1 in 'SI' and c2 in 'SI')):
-                    voxsize_swapped[i] = voxsize[j]
-                    break
-        voxsize = voxsize_swapped
-
-        # initialize new
-        data = self.data.copy()
-        affine = self.geom.vox2world.matrix.copy()
-
-        # align axes
-        affine[:, world_axes_trg] = affine[:, world_axes_src]
-        for i in range(self.basedim):
-            if world_axes_src[i] != world_axes_trg[i]:
-                data = np.swapaxes(data, world_axes_src[i], world_axes_trg[i])
-                swapped_axis_idx = np.where(world_axes_src == world_axes_trg[i])
-                world_axes_src[swapped_axis_idx], world_axes_src[i] = world_axes_src[i], world_axes_src[swapped_axis_idx]
-
-        # align directions
-        dot_products = np.sum(affine[:3, :3] * trg_matrix[:3, :3], axis=0)
-        for i in range(self.basedim):
-            if dot_products[i] < 0:
-                data = np.flip(data, axis=i)
-                affine[:, i] = - affine[:, i]
-                affine[:3, 3] = affine[:3, 3] - affine[:3, i] * (data.shape[i] - 1)
-
-        # update geometry
-        target_geom = ImageGeometry(
-            shape=data.shape[:3],
-            vox2world=affine,
-            voxsize=voxsize)
+        # the data is only permuted and flipped as a view, and then copied once at the
+        # end, so the volume is traversed a single time
+        data = self.data.transpose(list(axes) + list(range(3, self.data.ndim)))
+        data = data[flips].copy()
         return self.new(data, target_geom)
 
     def reshape(self, shape, center='image', copy=True):
@@ -554,37 +521,20 @@ class FramedImage(FramedArray):
             # return the bbox centered cropping
             return self[bbox_centered_cropping]
 
-        delta = (np.array(shape) - np.array(self.baseshape)) / 2
-        low = np.floor(delta).astype(int)
-        high = np.ceil(delta).astype(int)
-
-        c_low = np.clip(low, 0, None)
-        c_high = np.clip(high, 0, None)
-        padding = list(zip(np.append(c_low, 0), np.append(c_high, 0)))
-        conformed_data = np.pad(self.framed_data, padding, mode='constant')
-
-        # low and high are intentionally swapped here
-        c_low = np.clip(-high, 0, None)
-        c_high = conformed_data.shape[:3] - np.clip(-low, 0, None)
-        cropping = tuple([slice(a, b) for a, b in zip(c_low, c_high)])
-        conformed_data = conformed_data[cropping]
-
-        # compute new affine if one exists
-        matrix = np.eye(4)
-        matrix[:3, :3] = self.geom.vox2world.matrix[:3, :3]
-        p0crs = np.clip(-high, 0, None) - np.clip(low, 0, None)
-        p0 = self.geom.vox2world(p0crs)
-        matrix[:3, 3] = p0
-        pcrs = np.append(np.array(conformed_data.shape[:3]) / 2, 1)
-        cras = np.matmul(matrix, pcrs)[:3]
-        matrix[:3, 3] = 0
-        matrix[:3, 3] = cras - np.matmul(matrix, pcrs)[:3]
-
-        # update geometry
-        target_geom = ImageGeometry(
-            shape=conformed_data.shape[:3],
-            vox2world=matrix,
-            voxsize=self.geom.voxsize)
+        # copy the overlapping region into a zero-filled array of the target shape, which
+        # pads and crops each axis around the image center in a single pass
+        offsets = centered_offsets(self.baseshape, shape)
+        conformed_data = np.zeros((*shape, self.nframes), dtype=self.dtype)
+        target_slicing = []
+        source_slicing = []
+        for n, m, offset in zip(self.baseshape, shape, offsets):
+            start = max(0, -offset)
+            stop = min(n, m - offset)
+            source_slicing.append(slice(start, stop))
+            target_slicing.append(slice(start + offset, stop + offset))
+        conformed_data[tuple(target_slicing)] = self.framed_data[tuple(source_slicing)]
+
+        target_geom = reshaped_geometry(self.geom, shape)
         return self.new(conformed_data, target_geom)
 
     def fit_to_shape(self, shape, center=None, copy=True):
@@ -634,14 +584,55 @@ class FramedImage(FramedArray):
         conformed = self
         if orientation is not None:
             conformed = conformed.reorient(orientation, copy=False)
-        if voxsize is not None:
-            conformed = conformed.resize(voxsize, method=method, copy=False)
-        if shape is not None:
-            conformed = conformed.reshape(shape, copy=False)
+
+        # when the image must be both resized and reshaped, interpolate the resized data
+        # directly into the reshaped array, instead of materializing the resized volume
+        resized_geom = None
+        if voxsize is not None and shape is not None and self.basedim == 3:
+            resized_geom = resized_geometry(conformed.geom, voxsize)
+
+        if resized_geom is not None:
+            conformed = conformed._resize_reshape(resized_geom, shape, method)
+        else:
+            if voxsize is not None:
+                conformed = conformed.resize(voxsize, method=method, copy=False)
+            if shape is not None:
+                conformed = conformed.reshape(shape, copy=False)
         if dtype is not None:
             conformed = conformed.astype(dtype, copy=False)
         return self.copy() if (copy and conformed is self) else conformed
 
+    def _resize_reshape(self, resized_geom, shape, method):
+        """
+        Resize to a geometry and then reshape to a target shape, equivalent to calling
+        `resize` followed by `reshape`, but interpolating only the region of the resized
+        grid that remains after reshaping.
+        """
+        shape = tuple(shape[:3])
+        offsets = centered_offsets(resized_geom.shape, shape)
+        target_slicing = []
+        window_start = []
+        window_shape = []
+        for n, m, offset in zip(resized_geom.shape, shape, offsets):
+            start = max(0, -offset)
+            stop = min(n, m - offset)
+            target_slicing.append(slice(start + offset, stop + offset))
+            window_start.append(start)
+            window_shape.append(stop - start)
+
+        if min(window_shape) <= 0:
+            return self.resize(resized_geom.voxsize, method=method, copy=False).reshape(shape, copy=False)
+
+        # interpolate only the window of the resized grid, offsetting the target voxel
+        # indices so that sampling coordinates are identical to those of the full grid
+        affine = np.matmul(self.geom.world2vox.matrix, resized_geom.vox2world.matrix)
+        interped = interpolate(source=self.framed_data, target_shape=window_shape,
+                               method=method, affine=affine, offset=window_start)
+
+        conformed_data = np.zeros((*shape, self.nframes), dtype=interped.dtype)
+        conformed_data[tuple(target_slicing)] = interped
+        return self.new(conformed_data, reshaped_geometry(resized_geom, shape))
+
     def sample(self, points, method='linear', bounds_error=False, fill=None):
         """
         Interpolate values from the image grid at particular voxel coordinates.
@@ -894,6 +885,164 @@ class Volume(FramedImage):
         super().__init__(basedim=3, data=data, geometry=geometry, labels=labels, metadata=metadata)
 
 
+def reoriented_geometry(geom, orientation):
+    """
+    Compute the reorientation of a 3D image geometry to a specific slice orientation.
+
+    Parameters
+    ----------
+    geom : ImageGeometry
+        Source image geometry.
+    orientation : str
+        Case-insensitive orientation string.
+
+    Returns
+    -------
+    tuple or None
+        Tuple of (axes, flips, target_geom), where `axes` is the permutation of the source
+        base axes and `flips` is the slicing that flips the permuted axes, or None if the
+        geometry already has the target orientation.
+    """
+    trg_orientation = orientation.upper()
+    src_orientation = otn.rotation_matrix_to_orientation(geom.vox2world.matrix)
+    if trg_orientation == src_orientation.upper():
+        return None
+
+    # extract world axes. the orientation matrices are signed permutations, whose inverse
+    # is the transpose, so the axes can be found without inverting them
+    get_world_axes = lambda aff: np.argmax(np.absolute(aff), axis=1)
+    trg_matrix = otn.orientation_to_rotation_matrix(trg_orientation)
+    src_matrix = otn.orientation_to_rotation_matrix(src_orientation)
+    world_axes_trg = get_world_axes(trg_matrix[:3, :3])
+    world_axes_src = get_world_axes(src_matrix[:3, :3])
+
+    voxsize = np.asarray(geom.voxsize)
+    voxsize_swapped = np.ones(3)
+    for i in range(3):
+        c1 = trg_orientation[i]
+        for j in range(3):
+            c2 = src_orientation[j]
+            if ((c1 in 'RL' and c2 in 'RL') or
+                (c1 in 'AP' and c2 in 'AP') or
+                (c1 in 'SI' and c2 in 'SI')):
+                voxsize_swapped[i] = voxsize[j]
+                break
+    voxsize = voxsize_swapped
+
+    # align axes
+    affine = geom.vox2world.matrix.copy()
+    affine[:, world_axes_trg] = affine[:, world_axes_src]
+    axes = [0, 1, 2]
+    for src, trg in zip(world_axes_src, world_axes_trg):
+        axes[trg] = src
+    shape = [geom.shape[a] for a in axes]
+
+    # align directions
+    flipped = np.sum(affine[:3, :3] * trg_matrix[:3, :3], axis=0) < 0
+    flips = tuple(slice(None, None, -1) if f else slice(None) for f in flipped)
+    affine[:, :3][:, flipped] *= -1
+    affine[:3, 3] -= affine[:3, :3][:, flipped] @ (np.asarray(shape)[flipped] - 1)
+
+    target_geom = ImageGeometry(
+        shape=shape,
+        vox2world=affine,
+        voxsize=voxsize)
+    return axes, flips, target_geom
+
+
+def resized_geometry(geom, voxsize):
+    """
+    Compute the geometry of a 3D image resized to a specific voxel size.
+
+    Parameters
+    ----------
+    geom : ImageGeometry
+        Source image geometry.
+    voxsize : array_like
+        Target voxel size in millimeters.
+
+    Returns
+    -------
+    ImageGeometry or None
+        Resized image geometry, or None if the voxel size is already satisfied.
+    """
+    if np.isscalar(voxsize):
+        # deal with a scalar voxel size input
+        voxsize = np.repeat(voxsize, 3).astype('float')
+    else:
+        # ensure array has length of 3
+        voxsize = np.asarray(voxsize, dtype='float')
+        check_array(voxsize, ndim=1, shape=3, name='voxsize')
+
+    if np.allclose(geom.voxsize, voxsize, atol=1e-5, rtol=0):
+        return None
+
+    # geometry shapes are always 3D
+    target_shape = np.asarray(geom.voxsize, dtype='float') * geom.shape / voxsize
+    target_shape = tuple(np.ceil(target_shape).astype(int))
+
+    return ImageGeometry(
+        shape=target_shape,
+        voxsize=voxsize,
+        rotation=geom.rotation,
+        center=geom.center)
+
+
+def reshaped_geometry(geom, shape):
+    """
+    Compute the geometry of a 3D image that is padded or cropped, around the image
+    center, to a specific shape.
+
+    Parameters
+    ----------
+    geom : ImageGeometry
+        Source image geometry.
+    shape : tuple of int
+        Target base shape.
+
+    Returns
+    -------
+    ImageGeometry
+        Reshaped image geometry.
+    """
+    shape = tuple(shape[:3])
+
+    # the reshaped image is just shifted, so the new voxel-to-world translation is the
+    # world coordinate of the source voxel at the new origin
+    p0crs = [-offset for offset in centered_offsets(geom.shape, shape)]
+    matrix = geom.vox2world.matrix.copy()
+    matrix[:3, 3] += matrix[:3, :3] @ p0crs
+
+    return ImageGeometry(
+        shape=shape,
+        vox2world=matrix,
+        voxsize=geom.voxsize)
+
+
+def centered_offsets(source_shape, target_shape):
+    """
+    Compute the per-axis voxel offsets that center a source image shape within a
+    target shape, when padding or cropping. For odd differences, the extra voxel is
+    padded or cropped at the end of the axis.
+
+    Parameters
+    ----------
+    source_shape, target_shape : tuple of int
+        Source and target base shapes.
+
+    Returns
+    -------
+    list of int
+        Target voxel index of each source axis origin.
+    """
+    offsets = []
+    for n, m in zip(source_shape, target_shape):
+        delta = int(m) - int(n)
+        # pad by floor(delta / 2) at the start, or crop by ceil(-delta / 2)
+        offsets.append(delta // 2 if delta >= 0 else -(-delta // 2))
+    return offsets
+
+
 def cast_image(obj, allow_none=True, copy=False, fallback_geom=None):
     """
     Cast object to `Volume` or `Slice` type.
@@ -8,7 +8,7 @@ from libc.math cimport floor
 from libc.math cimport round
 
 
-def interpolate(source, target_shape, method, affine=None, disp=None, fill=0):
+def interpolate(source, target_shape, method, affine=None, disp=None, fill=0, offset=None):
     """
     Interpolate a 3D image given a voxel-to-voxel affine transform and/or a
     dense displacement field.
@@ -27,6 +27,10 @@ def interpolate(source, target_shape, method, affine=None, disp=None, fill=0):
         Dense vector displacement field. Base shape must match target shape.
     fill : scalar
         Fill value for out-of-bounds voxels.
+    offset : array_like of int, optional
+        Index of the first output voxel within a larger target grid, to interpolate only a
+        window of that grid. The affine maps the full target grid, and the source
+        coordinates of each output voxel are computed exactly as they would be for it.
 
     Returns
     -------
@@ -89,6 +93,7 @@ def interpolate(source, target_shape, method, affine=None, disp=None, fill=0):
 
     # speeds up if conditionals are computed outside of function (TODO is this even true?)
     shape = np.asarray(target_shape).astype('int64')
+    offset = np.zeros(3, dtype='int64') if offset is None else np.asarray(offset).astype('int64')
 
     # ensure correct byteorder
     # TODO maybe this should be done at read-time?
@@ -104,7 +109,7 @@ def interpolate(source, target_shape, method, affine=None, disp=None, fill=0):
     # run the actual interpolation
     # TODO: there's really no need to have a combined affine and deformation function.
     # these should be split up for simplicity sake (might optimize things a bit too)
-    resampled = interp_func(source, shape, affine, disp, fill, use_affine, use_disp)
+    resampled = interp_func(source, shape, offset, affine, disp, fill, use_affine, use_disp)
 
     # if the input type was unsupported but nearest-neighbor interpolation was used,
     # convert back to the original dtype
@@ -132,6 +137,7 @@ ctypedef fused datatype:
 @cython.wraparound(False)
 def interp_3d_fortran_nearest(const datatype[::1, :, :, :] source,
                               np.ndarray[np.int_t, ndim=1] target_shape,
+                              np.ndarray[np.int_t, ndim=1] target_offset,
                               const float[:, ::1] mat,
                               const float[::1, :, :, :] disp,
                               datatype fill_value,
@@ -149,6 +155,11 @@ def interp_3d_fortran_nearest(const datatype[::1, :, :, :] source,
     cdef Py_ssize_t y_max = target_shape[1]
     cdef Py_ssize_t z_max = target_shape[2]
 
+    # index of the first target voxel within the full target grid
+    cdef Py_ssize_t x_off = target_offset[0]
+    cdef Py_ssize_t y_off = target_offset[1]
+    cdef Py_ssize_t z_off = target_offset[2]
+
     # fill value
     cdef datatype fill = fill_value
 
@@ -200,13 +211,13 @@ def interp_3d_fortran_nearest(const datatype[::1, :, :, :] source,
                 # transform the current target coordinate to get
                 # the point in source space
                 if use_disp:
-                    ix = x + disp[x, y, z, 0]
-                    iy = y + disp[x, y, z, 1]
-                    iz = z + disp[x, y, z, 2]
+                    ix = (x + x_off) + disp[x, y, z, 0]
+                    iy = (y + y_off) + disp[x, y, z, 1]
+                    iz = (z + z_off) + disp[x, y, z, 2]
                 else:
-                    ix = x
-                    iy = y
-                    iz = z
+                    ix = x + x_off
+                    iy = y + y_off
+                    iz = z + z_off
 
                 if use_affine:
                     sx = (mat00 * ix) + (mat01 * iy) + (mat02 * iz) + mat03
@@ -244,6 +255,7 @@ def interp_3d_fortran_nearest(const datatype[::1, :, :, :] source,
 @cython.wraparound(False)
 def interp_3d_fortran_linear(const datatype[::1, :, :, :] source,
                              np.ndarray[np.int_t, ndim=1] target_shape,
+                             np.ndarray[np.int_t, ndim=1] target_offset,
                              const float[:, ::1] mat,
                              const float[::1, :, :, :] disp,
                              datatype fill_value,
@@ -261,6 +273,11 @@ def interp_3d_fortran_linear(const datatype[::1, :, :, :] source,
     cdef Py_ssize_t y_max = target_shape[1]
     cdef Py_ssize_t z_max = target_shape[2]
 
+    # index of the first target voxel within the full target grid
+    cdef Py_ssize_t x_off = target_offset[0]
+    cdef Py_ssize_t y_off = target_offset[1]
+    cdef Py_ssize_t z_off = target_offset[2]
+
     # fill value
     cdef float fill = fill_value
 
@@ -304,13 +321,13 @@ def interp_3d_fortran_linear(const datatype[::1, :, :, :] source,
                 # transform the current target coordinate to get
                 # the point in source space
                 if use_disp:
-                    ix = x + disp[x, y, z, 0]
-                    iy = y + disp[x, y, z, 1]
-                    iz = z + disp[x, y, z, 2]
+                    ix = (x + x_off) + disp[x, y, z, 0]
+                    iy = (y + y_off) + disp[x, y, z, 1]
+                    iz = (z + z_off) + disp[x, y, z, 2]
                 else:
-                    ix = x
-                    iy = y
-                    iz = z
+                    ix = x + x_off
+                    iy = y + y_off
+                    iz = z + z_off
 
                 if use_affine:
                     sx = (mat00 * ix) + (mat01 * iy) + (mat02 * iz) + mat03
@@ -382,6 +399,7 @@ def interp_3d_fortran_linear(const datatype[::1, :, :, :] source,
 @cython.wraparound(False)
 def interp_3d_contiguous_nearest(const datatype[:, :, :, ::1] source,
                                  np.ndarray[np.int_t, ndim=1] target_shape,
+                                 np.ndarray[np.int_t, ndim=1] target_offset,
                                  const float[:, ::1] mat,
                                  const float[:, :, :, ::1] disp,
                                  datatype fill_value,
@@ -399,6 +417,11 @@ def interp_3d_contiguous_nearest(const datatype[:, :, :, ::1] source,
     cdef Py_ssize_t y_max = target_shape[1]
     cdef Py_ssize_t z_max = target_shape[2]
 
+    # index of the first target voxel within the full target grid
+    cdef Py_ssize_t x_off = target_offset[0]
+    cdef Py_ssize_t y_off = target_offset[1]
+    cdef Py_ssize_t z_off = target_offset[2]
+
     # fill value
     cdef datatype fill = fill_value
 
@@ -450,13 +473,13 @@ def interp_3d_contiguous_nearest(const datatype[:, :, :, ::1] source,
                 # transform the current target coordinate to get
                 # the point in source space
                 if use_disp:
-                    ix = x + disp[x, y, z, 0]
-                    iy = y + disp[x, y, z, 1]
-                    iz = z + disp[x, y, z, 2]
+                    ix = (x + x_off) + disp[x, y, z, 0]
+                    iy = (y + y_off) + disp[x, y, z, 1]
+                    iz = (z + z_off) + disp[x, y, z, 2]
                 else:
-                    ix = x
-                    iy = y
-                    iz = z
+                    ix = x + x_off
+                    iy = y + y_off
+                    iz = z + z_off
 
                 if use_affine:
                     sx = (mat00 * ix) + (mat01 * iy) + (mat02 * iz) + mat03
@@ -494,6 +517,7 @@ def interp_3d_contiguous_nearest(const datatype[:, :, :, ::1] source,
 @cython.wraparound(False)
 def interp_3d_contiguous_linear(const datatype[:, :, :, ::1] source,
                                 np.ndarray[np.int_t, ndim=1] target_shape,
+                                np.ndarray[np.int_t, ndim=1] target_offset,
                                 const float[:, ::1] mat,
                                 const float[:, :, :, ::1] disp,
                                 datatype fill_value,
@@ -511,6 +535,11 @@ def interp_3d_contiguous_linear(const datatype[:, :, :, ::1] source,
     cdef Py_ssize_t y_max = target_shape[1]
     cdef Py_ssize_t z_max = target_shape[2]
 
+    # index of the first target voxel within the full target grid
+    cdef Py_ssize_t x_off = target_offset[0]
+    cdef Py_ssize_t y_off = target_offset[1]
+    cdef Py_ssize_t z_off = target_offset[2]
+
     # fill value
     cdef float fill = fill_value
 
@@ -554,13 +583,13 @@ def interp_3d_contiguous_linear(const datatype[:, :, :, ::1] source,
                 # transform the current target coordinate to get
                 # the point in source space
                 if use_disp:
-                    ix = x + disp[x, y, z, 0]
-                    iy = y + disp[x, y, z, 1]
-                    iz = z + disp[x, y, z, 2]
+                    ix = (x + x_off) + disp[x, y, z, 0]
+                    iy = (y + y_off) + disp[x, y, z, 1]
+                    iz = (z + z_off) + disp[x, y, z, 2]
                 else:
-                    ix = x
-                    iy = y
-                    iz = z
+                    ix = x + x_off
+                    iy = y + y_off
+                    iz = z + z_off
 
                 if use_affine:
                     sx = (mat00 * ix) + (mat01 * iy) + (mat02 * iz) + mat03
@@ -1,5 +1,6 @@
 from .utils import check_file_readability
 from .affine import load_affine
+from .affine import load_affines
 from .framed import load_volume
 from .framed import load_slice
 from .framed import load_overlay
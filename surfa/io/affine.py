@@ -1,4 +1,5 @@
 import os
+import concurrent.futures
 import numpy as np
 
 from surfa.io import fsio
@@ -38,6 +39,34 @@ def load_affine(filename, fmt=None):
     return iop().load(filename)
 
 
+def load_affines(filenames, fmt=None, workers=None):
+    """
+    Load a batch of `Affine` objects from files. Files are read concurrently by a
+    pool of threads, since loading many small transform files is dominated by I/O
+    latency rather than parsing.
+
+    Parameters
+    ----------
+    filenames : sequence of str
+        File paths to read.
+    fmt : str, optional
+        Forced file format. If None (default), file format is extrapolated
+        from extension.
+    workers : int, optional
+        Maximum number of reader threads. Defaults to the executor default.
+
+    Returns
+    -------
+    list of Affine
+        Loaded affines, in the order of the input files.
+    """
+    filenames = list(filenames)
+    if len(filenames) < 2 or workers == 1:
+        return [load_affine(filename, fmt=fmt) for filename in filenames]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda filename: load_affine(filename, fmt=fmt), filenames))
+
+
 def save_affine(aff, filename, fmt=None):
     """
     Save a `Affine` object to file.
@@ -87,9 +116,10 @@ class LinearTransformArrayIO(protocol.IOProtocol):
         Affine
             Affine object loaded from file.
         """
+        # read the file at once and drop empty and comment lines in a single pass
         with open(filename, 'r') as file:
-            lines = [line.rstrip() for line in file]
-            lines = [line for line in lines if line and not line.startswith('#')]
+            text = file.read()
+        lines = [line for line in map(str.rstrip, text.splitlines()) if line and not line.startswith('#')]
 
         # determine the coodinate space
         space_id = int(lines[0].split()[2])
@@ -100,11 +130,11 @@ class LinearTransformArrayIO(protocol.IOProtocol):
             raise ValueError(f'unknown affine LTA type ID: {space_id}')
 
         # read in the actual matrix data
-        matrix = np.asarray([line.split() for line in lines[5:9]], dtype=np.float64)
+        matrix = np.fromstring(' '.join(lines[5:9]), dtype=np.float64, sep=' ').reshape(4, 4)
 
         # read in source and target geometry (if valid)
-        source = fsio.image_geometry_from_string('\n'.join(lines[10:18]))
-        target = fsio.image_geometry_from_string('\n'.join(lines[19:27]))
+        source = fsio.image_geometry_from_lines(lines[10:18])
+        target = fsio.image_geometry_from_lines(lines[19:27])
         if source is None and target is None:
             space = None
 
@@ -121,38 +151,36 @@ class LinearTransformArrayIO(protocol.IOProtocol):
         filename : str
             Target file path.
         """
-        with open(filename, 'w') as file:
-
-            # determine LTA coordinate space
-            if aff.space is None or aff.space == 'vox':
-                file.write('type      = 0 # LINEAR_VOX_TO_VOX\n')
-            elif aff.space == 'world':
-                file.write('type      = 1 # LINEAR_RAS_TO_RAS\n')
-            elif aff.space == 'surf':
-                file.write('type      = 3 # LINEAR_SURF_TO_SURF\n')
-            else:
-                raise NotImplementedError(f'cannot write coodinate space {aff.space} to LTA - this is a '
-                                           'bug, not a user error')
-
+        # determine LTA coordinate space
+        if aff.space is None or aff.space == 'vox':
+            header = 'type      = 0 # LINEAR_VOX_TO_VOX\n'
+        elif aff.space == 'world':
+            header = 'type      = 1 # LINEAR_RAS_TO_RAS\n'
+        elif aff.space == 'surf':
+            header = 'type      = 3 # LINEAR_SURF_TO_SURF\n'
+        else:
+            raise NotImplementedError(f'cannot write coodinate space {aff.space} to LTA - this is a '
+                                       'bug, not a user error')
+
+        # assemble the file contents so that they're written at once
+        parts = [
+            header,
             # this is all useless legacy information
-            file.write('nxforms   = 1\n')
-            file.write('mean      = 0.0000 0.0000 0.0000\n')
-            file.write('sigma     = 1.0000\n')
-            file.write('1 4 4\n')
-
-            # write the actual matrix data
-            file.write('%.15e %.15e %.15e %.15e\n' % tuple(aff.matrix[0]))
-            file.write('%.15e %.15e %.15e %.15e\n' % tuple(aff.matrix[1]))
-            file.write('%.15e %.15e %.15e %.15e\n' % tuple(aff.matrix[2]))
-            file.write('%.15e %.15e %.15e %.15e\n' % tuple(aff.matrix[3]))
-
-            # write source geometry (if any)
-            file.write('src volume info\n')
-            file.write(fsio.image_geometry_to_string(aff.source))
-
-            # write target geometry (if any)
-            file.write('dst volume info\n')
-            file.write(fsio.image_geometry_to_string(aff.target))
+            'nxforms   = 1\n',
+            'mean      = 0.0000 0.0000 0.0000\n',
+            'sigma     = 1.0000\n',
+            '1 4 4\n',
+            # the actual matrix data
+            ''.join(['%.15e %.15e %.15e %.15e\n' % tuple(row) for row in aff.matrix]),
+            # source and target geometry (if any)
+            'src volume info\n',
+            fsio.image_geometry_to_string(aff.source),
+            'dst volume info\n',
+            fsio.image_geometry_to_string(aff.target),
+        ]
+
+        with open(filename, 'w') as file:
+            file.write(''.join(parts))
 
 
 # enabled affine IO protocol classes
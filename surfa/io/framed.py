@@ -1,6 +1,5 @@
 import os
 import warnings
-import gzip
 import numpy as np
 
 from surfa import Volume
@@ -16,13 +15,16 @@ from surfa.io import protocol
 from surfa.io.utils import read_int
 from surfa.io.utils import write_int
 from surfa.io.utils import read_bytes
+from surfa.io.utils import read_array
 from surfa.io.utils import write_bytes
+from surfa.io.utils import write_array
 from surfa.io.utils import read_geom
 from surfa.io.utils import write_geom
 from surfa.io.utils import check_file_readability
+from surfa.io.utils import open_gzip
 
 
-def load_volume(filename, fmt=None):
+def load_volume(filename, fmt=None, metadata=True):
     """
     Load an image `Volume` from a 3D array file.
 
@@ -32,16 +34,20 @@ def load_volume(filename, fmt=None):
         File path to read.
     fmt : str, optional
         Explicit file format. If None, we extrapolate from the file extension.
+    metadata : bool
+        Read the scan parameters and metadata tags (such as the command history and
+        embedded label lookup table) stored after the data buffer. Disabling this
+        avoids reading, and decompressing, the end of MGH/MGZ files.
 
     Returns
     -------
     Volume
         Loaded volume.
     """
-    return load_framed_array(filename=filename, atype=Volume, fmt=fmt)
+    return load_framed_array(filename=filename, atype=Volume, fmt=fmt, metadata=metadata)
 
 
-def load_slice(filename, fmt=None):
+def load_slice(filename, fmt=None, metadata=True):
     """
     Load an image `Slice` from a 2D array file.
 
@@ -51,16 +57,20 @@ def load_slice(filename, fmt=None):
         File path to read.
     fmt : str, optional
         Explicit file format. If None, we extrapolate from the file extension.
+    metadata : bool
+        Read the scan parameters and metadata tags (such as the command history and
+        embedded label lookup table) stored after the data buffer. Disabling this
+        avoids reading, and decompressing, the end of MGH/MGZ files.
 
     Returns
     -------
     Slice
         Loaded slice.
     """
-    return load_framed_array(filename=filename, atype=Slice, fmt=fmt)
+    return load_framed_array(filename=filename, atype=Slice, fmt=fmt, metadata=metadata)
 
 
-def load_overlay(filename, fmt=None):
+def load_overlay(filename, fmt=None, metadata=True):
     """
     Load a surface `Overlay` from a 1D array file.
 
@@ -70,13 +80,17 @@ def load_overlay(filename, fmt=None):
         File path to read.
     fmt : str, optional
         Explicit file format. If None, we extrapolate from the file extension.
+    metadata : bool
+        Read the scan parameters and metadata tags (such as the command history and
+        embedded label lookup table) stored after the data buffer. Disabling this
+        avoids reading, and decompressing, the end of MGH/MGZ files.
 
     Returns
     -------
     Overlay
         Loaded overlay.
     """
-    return load_framed_array(filename=filename, atype=Overlay, fmt=fmt)
+    return load_framed_array(filename=filename, atype=Overlay, fmt=fmt, metadata=metadata)
 
 
 def load_warp(filename, fmt=None):
@@ -98,7 +112,7 @@ def load_warp(filename, fmt=None):
     return load_framed_array(filename=filename, atype=Warp, fmt=fmt)
 
 
-def load_framed_array(filename, atype, fmt=None):
+def load_framed_array(filename, atype, fmt=None, metadata=True):
     """
     Generic loader for `FramedArray` objects.
 
@@ -110,6 +124,10 @@ def load_framed_array(filename, atype, fmt=None):
         Particular FramedArray subclass to read into.
     fmt : str, optional
         Explicit file format. If None, we extrapolate from the file extension.
+    metadata : bool
+        Read the scan parameters and metadata tags (such as the command history and
+        embedded label lookup table) stored after the data buffer. Disabling this
+        avoids reading, and decompressing, the end of MGH/MGZ files.
 
     Returns
     -------
@@ -132,6 +150,9 @@ def load_framed_array(filename, atype, fmt=None):
         if iop is None:
             raise ValueError(f'unknown file format {fmt}')
 
+    # only MGH files support skipping the trailing metadata
+    if issubclass(iop, MGHArrayIO):
+        return iop().load(filename, atype, metadata=metadata)
     return iop().load(filename, atype)
 
 
@@ -161,11 +182,11 @@ def save_framed_array(arr, filename, fmt=None, intent=FramedArrayIntents.mri):
         if iop.name != 'curv':
             filename = iop.enforce_extension(filename)
 
-    # pass intent if iop() is an instance of MGHArrayIO or NiftiArrayIO
-    if (isinstance(iop(), MGHArrayIO) or isinstance(iop(), NiftiArrayIO)):
-       iop().save(arr, filename, intent=intent)
+    # pass intent if iop is a subclass of MGHArrayIO or NiftiArrayIO
+    if issubclass(iop, (MGHArrayIO, NiftiArrayIO)):
+        iop().save(arr, filename, intent=intent)
     else:
-       iop().save(arr, filename)
+        iop().save(arr, filename)
 
 
 def framed_array_from_4d(atype, data):
@@ -213,6 +234,32 @@ class MGHArrayIO(protocol.IOProtocol):
     name = 'mgh'
     extensions = ('.mgz', 'mgh', '.mgh.gz')
 
+    # numpy datatypes corresponding to FreeSurfer datatype IDs
+    datatypes = {
+        0:  np.dtype('>u1'),  # uchar
+        1:  np.dtype('>i4'),  # int32
+        2:  np.dtype('>i8'),  # int64
+        3:  np.dtype('>f4'),  # float
+        4:  np.dtype('>i2'),  # short
+        6:  np.dtype('>f4'),  # tensor
+        7:  np.dtype('>c8'),  # complex64
+        10: np.dtype('>u2'),  # ushort
+    }
+
+    # fixed-size header preceding the data buffer. the geometry fields are only
+    # meaningful if the valid geometry flag is set, and the rest is unused space
+    header_dtype = np.dtype([
+        ('version', '>i4'),
+        ('shape', '>u4', 4),
+        ('dtype', '>u4'),
+        ('dof', '>u4'),
+        ('valid_geometry', '>u2'),
+        ('voxsize', '>f4', 3),
+        ('rotation', '>f4', 9),
+        ('center', '>f4', 3),
+        ('unused', 'V194'),
+    ])
+
     def dtype_from_id(self, id):
         """
         Convert a FreeSurfer datatype ID to a numpy datatype.
@@ -227,22 +274,12 @@ class MGHArrayIO(protocol.IOProtocol):
         np.dtype
             Converted numpy datatype.
         """
-        mgh_types = {
-            0:  '>u1',  # uchar
-            1:  '>i4',  # int32
-            2:  '>i8',  # int64
-            3:  '>f4',  # float
-            4:  '>i2',  # short
-            6:  '>f4',  # tensor
-            7:  '>c8',  # complex64
-            10: '>u2',  # ushort
-        }
-        dtype = mgh_types.get(id)
+        dtype = self.datatypes.get(id)
         if dtype is None:
             raise NotImplementedError(f'unsupported MGH data type ID: {id}')
-        return np.dtype(dtype)
+        return dtype
 
-    def load(self, filename, atype):
+    def load(self, filename, atype, metadata=True):
         """
         Read array from an MGH/MGZ file.
 
@@ -252,6 +289,8 @@ class MGHArrayIO(protocol.IOProtocol):
             File path to read.
         atype : class
             FramedArray subclass to load.
+        metadata : bool
+            Read the scan parameters and metadata tags that follow the data buffer.
 
         Returns
         -------
@@ -260,41 +299,44 @@ class MGHArrayIO(protocol.IOProtocol):
         """
 
         # check if the file is gzipped
-        fopen = gzip.open if str(filename).lower().endswith('gz') else open
+        fopen = open_gzip if str(filename).lower().endswith('gz') else open
         with fopen(filename, 'rb') as file:
 
-            # read version number, retrieve intent
-            intent = read_bytes(file, '>i4', 1) >> 8 & 0xffff
+            # read the entire fixed-size header at once
+            header = read_bytes(file, self.header_dtype)
 
-            # read shape and type info
-            shape = read_bytes(file, '>u4', 4)
-            dtype_id = read_bytes(file, '>u4')
-            dof = read_bytes(file, '>u4')
+            # retrieve intent from version number
+            intent = header['version'] >> 8 & 0xffff
 
-            # read geometry
-            geom_params = {}
-            unused_header_space = 254
-            valid_geometry = bool(read_bytes(file, '>u2'))
+            # read shape and type info
+            shape = header['shape']
+            dtype_id = header['dtype']
 
             # ignore geometry if flagged as invalid
-            if valid_geometry:
+            geom_params = {}
+            if header['valid_geometry']:
                 geom_params = dict(
-                    voxsize=read_bytes(file, '>f4', 3),
-                    rotation=read_bytes(file, '>f4', 9).reshape((3, 3), order='F'),
-                    center=read_bytes(file, '>f4', 3),
+                    voxsize=header['voxsize'],
+                    rotation=header['rotation'].reshape((3, 3), order='F'),
+                    center=header['center'],
                 )
-                unused_header_space -= 60
-
-            # skip empty header space
-            file.read(unused_header_space)
 
             # read data buffer (MGH files store data in fortran order)
             dtype = self.dtype_from_id(dtype_id)
-            data = read_bytes(file, dtype, int(np.prod(shape))).reshape(shape, order='F')
+            data = read_array(file, dtype, shape, order='F')
 
             # init array
             arr = framed_array_from_4d(atype, data)
 
+            # update image-specific information from the header
+            if isinstance(arr, FramedImage):
+                arr.geom.update(**geom_params)
+                arr._metadata['intent'] = intent
+
+            # everything after the data buffer is optional metadata
+            if not metadata:
+                return arr
+
             # read scan parameters
             # these are not required, so first let's make sure we're not at EOF
             scan_params = {}
@@ -311,11 +353,8 @@ class MGHArrayIO(protocol.IOProtocol):
                 # use the read() function directly in case end-of-file is reached
                 file.read(np.dtype('>f4').itemsize)
 
-            # update image-specific information
             if isinstance(arr, FramedImage):
-                arr.geom.update(**geom_params)
-                arr.metadata.update(scan_params)
-                arr.metadata['intent'] = intent
+                arr._metadata.update(scan_params)
 
             # read metadata tags
             while True:
@@ -326,10 +365,10 @@ class MGHArrayIO(protocol.IOProtocol):
                 # command history
                 elif tag == fsio.tags.history:
                     history = file.read(length).decode('utf-8').rstrip('\x00')
-                    if arr.metadata.get('history'):
-                        arr.metadata['history'].append(history)
+                    if arr._metadata.get('history'):
+                        arr._metadata['history'].append(history)
                     else:
-                        arr.metadata['history'] = [history]
+                        arr._metadata['history'] = [history]
 
                 # embedded lookup table
                 elif tag == fsio.tags.old_colortable:
@@ -339,37 +378,37 @@ class MGHArrayIO(protocol.IOProtocol):
                 elif tag == fsio.tags.pedir:
                     pedir = file.read(length).decode('utf-8').rstrip('\x00')
                     if pedir != 'UNKNOWN':
-                        arr.metadata['phase-encode-direction'] = pedir
+                        arr._metadata['phase-encode-direction'] = pedir
 
                 # field strength
                 elif tag == fsio.tags.fieldstrength:
-                    arr.metadata['field-strength'] = read_bytes(file, dtype='>f4')
+                    arr._metadata['field-strength'] = read_bytes(file, dtype='>f4')
 
                 # gcamorph src & trg geoms (mgz warp)
                 elif tag == fsio.tags.gcamorph_geom:
                     arr.source, valid, fname = read_geom(file)
-                    arr.metadata['source-valid'] = valid
-                    arr.metadata['source-fname'] = fname
+                    arr._metadata['source-valid'] = valid
+                    arr._metadata['source-fname'] = fname
 
                     arr.target, valid, fname = read_geom(file)
-                    arr.metadata['target-valid'] = valid
-                    arr.metadata['target-fname'] = fname
+                    arr._metadata['target-valid'] = valid
+                    arr._metadata['target-fname'] = fname
 
                 # gcamorph src & trg geoms (mgz warp)
                 elif tag == fsio.tags.gcamorph_geom_plusshear:
                     arr.source, valid, fname = read_geom(file, shearless=False)
-                    arr.metadata['source-valid'] = valid
-                    arr.metadata['source-fname'] = fname
+                    arr._metadata['source-valid'] = valid
+                    arr._metadata['source-fname'] = fname
 
                     arr.target, valid, fname = read_geom(file, shearless=False)
-                    arr.metadata['target-valid'] = valid
-                    arr.metadata['target-fname'] = fname
+                    arr._metadata['target-valid'] = valid
+                    arr._metadata['target-fname'] = fname
 
                 # gcamorph meta (mgz warp: int int float)
                 elif tag == fsio.tags.gcamorph_meta:
                     arr.format = read_bytes(file, dtype='>i4')
-                    arr.metadata['spacing'] = read_bytes(file, dtype='>i4')
-                    arr.metadata['exp_k'] = read_bytes(file, dtype='>f4')
+                    arr._metadata['spacing'] = read_bytes(file, dtype='>i4')
+                    arr._metadata['exp_k'] = read_bytes(file, dtype='>f4')
 
                 # skip everything else
                 else:
@@ -390,9 +429,11 @@ class MGHArrayIO(protocol.IOProtocol):
             Target file path.
         """
 
-        # determine whether to write compressed data
+        # determine whether to write compressed data (the compression level can be
+        # tuned with the SURFA_MGZ_LEVEL environment variable)
         if str(filename).lower().endswith('gz'):
-            fopen = lambda f: gzip.open(f, 'wb', compresslevel=6)
+            compresslevel = int(os.environ.get('SURFA_MGZ_LEVEL', 6))
+            fopen = lambda f: open_gzip(f, 'wb', compresslevel=compresslevel)
         else:
             fopen = lambda f: open(f, 'wb')
 
@@ -424,56 +465,51 @@ class MGHArrayIO(protocol.IOProtocol):
             shape[:arr.basedim] = arr.baseshape
             shape[-1] = arr.nframes
 
-            # begin writing header
-            intent = arr.metadata.get('intent', intent)
-            version = ((intent & 0xffff) << 8) | 1  # encode intent in version
-            write_bytes(file, version, '>u4')  # version
-            write_bytes(file, shape, '>u4')  # shape
-            write_bytes(file, dtype_id, '>u4')  # MGH data type
-            write_bytes(file, 1, '>u4')  # DOF
+            # assemble the fixed-size header, which is zero-filled by default
+            header = np.zeros((), dtype=self.header_dtype)
+            intent = arr._metadata.get('intent', intent)
+            header['version'] = ((intent & 0xffff) << 8) | 1  # encode intent in version
+            header['shape'] = shape
+            header['dtype'] = dtype_id
+            header['dof'] = 1
 
             # include geometry only if necessary
-            unused_header_space = 254
             is_image = isinstance(arr, FramedImage)
-            write_bytes(file, is_image, '>u2')
+            header['valid_geometry'] = is_image
             if is_image:
                 # the mgz file type cannot store shear parameters
                 voxsize, rotation, center = arr.geom.shearless_components()
-                write_bytes(file, voxsize, '>f4')
-                write_bytes(file, np.ravel(rotation, order='F'), '>f4')
-                write_bytes(file, center, '>f4')
-                unused_header_space -= 60
+                header['voxsize'] = voxsize
+                header['rotation'] = np.ravel(rotation, order='F')
+                header['center'] = center
 
-            # fill empty header space
-            file.write(bytearray(unused_header_space))
+            file.write(header.tobytes())
 
             # write array data
-            write_bytes(file, np.ravel(arr.data, order='F'), self.dtype_from_id(dtype_id))
-
-            # write scan parameters
-            write_bytes(file, arr.metadata.get('tr', 0.0), '>f4')
-            write_bytes(file, arr.metadata.get('fa', 0.0), '>f4')
-            write_bytes(file, arr.metadata.get('te', 0.0), '>f4')
-            write_bytes(file, arr.metadata.get('ti', 0.0), '>f4')
+            write_array(file, arr.data, self.dtype_from_id(dtype_id), order='F')
 
             # compute FOV (freesurfer doesn't actually read this information though)
             volsize = pad_vector_length(arr.baseshape, 3, 1)
             fov = max(arr.geom.voxsize * volsize) if is_image else arr.shape[0]
-            write_bytes(file, fov, '>f4')
+
+            # write scan parameters, followed by the FOV
+            scan_params = [arr._metadata.get(key, 0.0) for key in ('tr', 'fa', 'te', 'ti')]
+            write_bytes(file, np.hstack([*scan_params, fov]), '>f4')
 
             # write lookup table tag
-            if arr.labels is not None:
+            labels = arr._metadata.get('labels')
+            if labels is not None:
                 fsio.write_tag(file, fsio.tags.old_colortable)
-                fsio.write_binary_lookup_table(file, arr.labels)
+                fsio.write_binary_lookup_table(file, labels)
 
             # phase encode direction
-            pedir = arr.metadata.get('phase-encode-direction', 'UNKNOWN')
+            pedir = arr._metadata.get('phase-encode-direction', 'UNKNOWN')
             fsio.write_tag(file, fsio.tags.pedir, len(pedir))
             file.write(pedir.encode('utf-8'))
 
             # field strength
             fsio.write_tag(file, fsio.tags.fieldstrength, 4)
-            write_bytes(file, arr.metadata.get('field-strength', 0.0), '>f4')
+            write_bytes(file, arr._metadata.get('field-strength', 0.0), '>f4')
 
             # gcamorph geom and gcamorph meta for mgz warp
             # output both fsio.tags.gcamorph_geom and fsio.tags.gcamorph_geom_plusshear
@@ -483,12 +519,12 @@ class MGHArrayIO(protocol.IOProtocol):
                 fsio.write_tag(file, fsio.tags.gcamorph_geom)
                 write_geom(file,
                            geom=arr.source,
-                           valid=arr.metadata.get('source-valid', True),
-                           fname=arr.metadata.get('source-fname', ''))
+                           valid=arr._metadata.get('source-valid', True),
+                           fname=arr._metadata.get('source-fname', ''))
                 write_geom(file,
                            geom=arr.target,
-                           valid=arr.metadata.get('target-valid', True),
-                           fname=arr.metadata.get('target-fname', ''))
+                           valid=arr._metadata.get('target-valid', True),
+                           fname=arr._metadata.get('target-fname', ''))
 
                 # fsio.tags.gcamorph_geom_plusshear
                 # gcamorph_geom_plusshear has a length, datalength needs to be consistent with write_geom()
@@ -496,23 +532,23 @@ class MGHArrayIO(protocol.IOProtocol):
                 fsio.write_tag(file, fsio.tags.gcamorph_geom_plusshear, datalength)
                 write_geom(file,
                            geom=arr.source,
-                           valid=arr.metadata.get('source-valid', True),
-                           fname=arr.metadata.get('source-fname', ''),
+                           valid=arr._metadata.get('source-valid', True),
+                           fname=arr._metadata.get('source-fname', ''),
                            shearless=False)
                 write_geom(file,
                            geom=arr.target,
-                           valid=arr.metadata.get('target-valid', True),
-                           fname=arr.metadata.get('target-fname', ''),
+                           valid=arr._metadata.get('target-valid', True),
+                           fname=arr._metadata.get('target-fname', ''),
                            shearless=False)
 
                 # gcamorph meta (mgz warp: int int float)
                 fsio.write_tag(file, fsio.tags.gcamorph_meta, 12)
                 write_bytes(file, arr.format, dtype='>i4')
-                write_bytes(file, arr.metadata.get('spacing', 1), dtype='>i4')
-                write_bytes(file, arr.metadata.get('exp_k', 0.0), dtype='>f4')
+                write_bytes(file, arr._metadata.get('spacing', 1), dtype='>i4')
+                write_bytes(file, arr._metadata.get('exp_k', 0.0), dtype='>f4')
 
             # write history tags
-            for hist in arr.metadata.get('history', []):
+            for hist in arr._metadata.get('history', []):
                 fsio.write_tag(file, fsio.tags.history, len(hist))
                 file.write(hist.encode('utf-8'))
 
@@ -578,12 +614,12 @@ class NiftiArrayIO(protocol.IOProtocol):
 
             voxsize = nii.header['pixdim'][1:4]
             arr.geom.update(vox2world=nii.affine, voxsize=voxsize)
-            arr.metadata['qform_code'] = int(nii.header['qform_code'])
-            arr.metadata['sform_code'] = int(nii.header['sform_code'])
+            arr._metadata['qform_code'] = int(nii.header['qform_code'])
+            arr._metadata['sform_code'] = int(nii.header['sform_code'])
             # temporal unit
             time_units_code = nii.header['xyzt_units'] & 56
-            arr.metadata['frame_units'] = self.code_to_units.get(time_units_code, 0)
-            arr.metadata['frame_dim'] = nii.header['pixdim'][4]
+            arr._metadata['frame_units'] = self.code_to_units.get(time_units_code, 0)
+            arr._metadata['frame_dim'] = nii.header['pixdim'][4]
             # spatial unit: always convert to mm and assume unknown is also mm
             spatial_units_code = nii.header['xyzt_units'] & 7
             if spatial_units_code == self.units_to_code['m']:
@@ -593,14 +629,14 @@ class NiftiArrayIO(protocol.IOProtocol):
 
             # freesurfer saves tr as msec internally
             time_units_factor = 0.0
-            if (arr.metadata['frame_units'] == 'sec'):
+            if (arr._metadata['frame_units'] == 'sec'):
                 time_units_factor = 1000.0
-            elif (arr.metadata['frame_units'] == 'msec'):
+            elif (arr._metadata['frame_units'] == 'msec'):
                 time_units_factor = 1.0
-            elif (arr.metadata['frame_units'] == 'usec'):
+            elif (arr._metadata['frame_units'] == 'usec'):
                 time_units_factor = 0.001
 
-            arr.metadata['tr'] = arr.metadata['frame_dim'] * time_units_factor
+            arr._metadata['tr'] = arr._metadata['frame_dim'] * time_units_factor
 
             # handle nifti1 header extension
             niiextsions = nii.header.extensions
@@ -652,7 +688,7 @@ class NiftiArrayIO(protocol.IOProtocol):
         """
         is_image = isinstance(arr, FramedImage)
 
-        intent = arr.metadata.get('intent', intent)
+        intent = arr._metadata.get('intent', intent)
         if (intent == FramedArrayIntents.warpmap):
             assert (isinstance(arr, Warp)), "arr needs to be a Warp object"
             arr = arr.convert(format=Warp.Format.disp_ras)
@@ -682,9 +718,9 @@ class NiftiArrayIO(protocol.IOProtocol):
 
         # initialize spatial and temporal spacing
         nii.header['pixdim'][:] = 1
-        nii.header['pixdim'][4] = arr.metadata.get('frame_dim', 1)
+        nii.header['pixdim'][4] = arr._metadata.get('frame_dim', 1)
         
-        tr = arr.metadata.get('tr')
+        tr = arr._metadata.get('tr')
         if (tr is not None):
             nii.header['pixdim'][4] = tr / 1000.0
 
@@ -693,7 +729,7 @@ class NiftiArrayIO(protocol.IOProtocol):
         spatial_units_code = self.units_to_code['mm']
         frame_units_code = self.units_to_code['sec']
         # check if frame units is set in metadata
-        frame_units = arr.metadata.get('frame_units')
+        frame_units = arr._metadata.get('frame_units')
         if frame_units is not None:
             metadata_code = self.units_to_code.get(frame_units)
             if metadata_code is None:
@@ -706,8 +742,8 @@ class NiftiArrayIO(protocol.IOProtocol):
 
         # geometry-specific header data
         if is_image:
-            nii.set_sform(arr.geom.vox2world.matrix, arr.metadata.get('sform_code', 1))
-            nii.set_qform(arr.geom.vox2world.matrix, arr.metadata.get('qform_code', 1))
+            nii.set_sform(arr.geom.vox2world.matrix, arr._metadata.get('sform_code', 1))
+            nii.set_qform(arr.geom.vox2world.matrix, arr._metadata.get('qform_code', 1))
             nii.header['pixdim'][1:4] = arr.geom.voxsize.astype(np.float32)
 
             # add freesurfer nifti1 header extension
@@ -751,8 +787,8 @@ class FreeSurferAnnotationIO(protocol.IOProtocol):
         values. Using this mapping, we can convert between a classic integer
         segmentation and annotation-style values.
         """
-        rgb = np.array([elt.color[:3].astype(np.int32) for elt in labels.values()])
-        idx = np.array(list(labels.keys()))
+        rgb = labels.colors[:, :3].astype(np.int32)
+        idx = np.fromiter(labels.keys(), dtype=np.int64, count=len(labels))
         mapping = np.zeros(idx.max() + 1, dtype=np.int32)
         mapping[idx] = (rgb[:, 2] << 16) + (rgb[:, 1] << 8) + rgb[:, 0]
         return mapping
@@ -828,14 +864,15 @@ class FreeSurferAnnotationIO(protocol.IOProtocol):
         if arr.nframes > 1:
             raise ValueError(f'annotations must only have 1 frame, but overlay has {arr.nframes} frames')
 
-        if arr.labels is None:
+        labels = arr._metadata.get('labels')
+        if labels is None:
             raise ValueError('overlay must have label lookup if saving as annotation')
 
         unknown_mask = arr.data < 0
 
         # make sure all indices exist in the label lookup
         cleaned = arr.data[np.logical_not(unknown_mask)]
-        found = np.in1d(cleaned, list(arr.labels.keys()))
+        found = np.in1d(cleaned, list(labels.keys()))
         if not np.all(found):
             missing = list(np.unique(cleaned[found == False]))
             raise ValueError('cannot save overlay as annotation because it contains the following values '
@@ -843,7 +880,7 @@ class FreeSurferAnnotationIO(protocol.IOProtocol):
 
         cleaned = arr.data.copy()
         cleaned[unknown_mask] = 0
-        colors = self.labels_to_mapping(arr.labels)[arr.data]
+        colors = self.labels_to_mapping(labels)[arr.data]
         colors[unknown_mask] = 0
 
         with open(filename, 'bw') as file:
@@ -860,7 +897,7 @@ class FreeSurferAnnotationIO(protocol.IOProtocol):
 
             # include the label lookup information
             fsio.write_tag(file, fsio.tags.old_colortable)
-            fsio.write_binary_lookup_table(file, arr.labels)
+            fsio.write_binary_lookup_table(file, labels)
 
 
 class FreeSurferCurveIO(protocol.IOProtocol):
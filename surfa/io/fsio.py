@@ -182,8 +182,24 @@ def image_geometry_from_string(string):
     ImageGeometry
         Converted image geometry.
     """
-    lines = string.splitlines()
+    return image_geometry_from_lines(string.splitlines())
 
+
+def image_geometry_from_lines(lines):
+    """
+    Convert ImageGeometry from the lines of a multi-line FS-style string, for
+    callers that have already split a file into lines.
+
+    Parameters
+    ----------
+    lines : sequence of str
+       Image geometry lines in FS string format.
+
+    Returns
+    -------
+    ImageGeometry
+        Converted image geometry.
+    """
     validline = lines[0].split()
     if validline[0] != 'valid':
         raise ValueError(f"geometry string must begin with 'valid' key, but got '{validline[0]}'")
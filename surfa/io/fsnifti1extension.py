@@ -515,22 +515,23 @@ class FSNifti1Extension:
             """
 
             # update input framedimage metadata
-            framedimage.metadata['intent'] = self.intent
+            framedimage.unshare_metadata()
+            framedimage._metadata['intent'] = self.intent
 
             if (self.intent == FramedArrayIntents.warpmap):
                 # gcamorph src & trg geoms (mgz warp)
                 framedimage.source = self.warpmeta['source-geom']
-                framedimage.metadata['source-valid'] = self.warpmeta['source-valid']
-                framedimage.metadata['source-fname'] = self.warpmeta['source-fname']
+                framedimage._metadata['source-valid'] = self.warpmeta['source-valid']
+                framedimage._metadata['source-fname'] = self.warpmeta['source-fname']
 
                 framedimage.target = self.warpmeta['target-geom']
-                framedimage.metadata['target-valid'] = self.warpmeta['target-valid']
-                framedimage.metadata['target-fname'] = self.warpmeta['target-fname']
+                framedimage._metadata['target-valid'] = self.warpmeta['target-valid']
+                framedimage._metadata['target-fname'] = self.warpmeta['target-fname']
 
                 # gcamorph meta (mgz warp: int int float)
                 framedimage.format = self.warpmeta['format']
-                framedimage.metadata['spacing'] = self.warpmeta['spacing']
-                framedimage.metadata['exp_k'] = self.warpmeta['exp_k']
+                framedimage._metadata['spacing'] = self.warpmeta['spacing']
+                framedimage._metadata['exp_k'] = self.warpmeta['exp_k']
 
                 return
 
@@ -542,17 +543,17 @@ class FSNifti1Extension:
                                        )
 
             if (self.scan_parameters):
-                framedimage.metadata['phase-encode-direction'] = self.scan_parameters['pedir']
-                framedimage.metadata['field-strength'] = self.scan_parameters['field_strength']
+                framedimage._metadata['phase-encode-direction'] = self.scan_parameters['pedir']
+                framedimage._metadata['field-strength'] = self.scan_parameters['field_strength']
 
                 scan_params = {}
                 scan_params['fa'] = self.scan_parameters['flip_angle']
                 scan_params['te'] = self.scan_parameters['te']
                 scan_params['ti'] = self.scan_parameters['ti']
-                framedimage.metadata.update(scan_params)
+                framedimage._metadata.update(scan_params)
 
             if (self.history):
-                framedimage.metadata['history'] = self.history
+                framedimage._metadata['history'] = self.history
 
             if (self.labels):
                 framedimage.labels = self.labels
@@ -570,7 +571,7 @@ class FSNifti1Extension:
             """
             self.endian = '>'
             self.version = 1
-            self.intent = image.metadata.get('intent', FramedArrayIntents.mri)
+            self.intent = image._metadata.get('intent', FramedArrayIntents.mri)
             self.dof = 1
             if isinstance(self.intent, np.int_):
                 self.intent = self.intent.item()  # convert numpy int to python int
@@ -581,17 +582,17 @@ class FSNifti1Extension:
 
                 # gcamorph src & trg geoms (mgz warp)
                 self.warpmeta['source-geom'] = image.source
-                self.warpmeta['source-valid'] = image.metadata.get('source-valid', True)
-                self.warpmeta['source-fname'] = image.metadata.get('source-fname', '')
+                self.warpmeta['source-valid'] = image._metadata.get('source-valid', True)
+                self.warpmeta['source-fname'] = image._metadata.get('source-fname', '')
 
                 self.warpmeta['target-geom'] = image.target
-                self.warpmeta['target-valid'] = image.metadata.get('target-valid', True)
-                self.warpmeta['target-fname'] = image.metadata.get('target-fname', '')
+                self.warpmeta['target-valid'] = image._metadata.get('target-valid', True)
+                self.warpmeta['target-fname'] = image._metadata.get('target-fname', '')
 
                 # gcamorph meta (mgz warp: int int float)
                 self.warpmeta['format'] = image.format
-                self.warpmeta['spacing'] = image.metadata.get('spacing', 1)
-                self.warpmeta['exp_k'] = image.metadata.get('exp_k', 0.0)
+                self.warpmeta['spacing'] = image._metadata.get('spacing', 1)
+                self.warpmeta['exp_k'] = image._metadata.get('exp_k', 0.0)
 
                 return
 
@@ -603,18 +604,18 @@ class FSNifti1Extension:
 
             # update scan_parameters
             self.scan_parameters = dict(
-                pedir = image.metadata.get('phase-encode-direction', 'UNKNOWN'),
-                field_strength = image.metadata.get('field-strength'),
-                flip_angle = image.metadata.get('fa', 0),
-                te = image.metadata.get('te', 0),
-                ti = image.metadata.get('ti', 0),
+                pedir = image._metadata.get('phase-encode-direction', 'UNKNOWN'),
+                field_strength = image._metadata.get('field-strength'),
+                flip_angle = image._metadata.get('fa', 0),
+                te = image._metadata.get('te', 0),
+                ti = image._metadata.get('ti', 0),
             )
 
-            if image.metadata.get('history'):
-                self.history = image.metadata['history']
+            if image._metadata.get('history'):
+                self.history = image._metadata['history']
 
-            if image.labels:
-                 self.labels = image.labels
+            if image._metadata.get('labels'):
+                 self.labels = image._metadata.get('labels')
 
 
         @property
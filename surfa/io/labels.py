@@ -2,7 +2,7 @@ import os
 import numpy as np
 
 from surfa.io import protocol
-from surfa.core.labels import LabelLookup
+from surfa.core.labels import lookup_from_table
 from surfa.io import check_file_readability
 
 
@@ -86,20 +86,26 @@ class FreeSurferLookupTableIO(protocol.IOProtocol):
         LabelLookup
             Object loaded from file.
         """
-        labels = LabelLookup()
         with open(filename, 'r') as file:
-            lines = file.readlines()
-        for line in lines:
-            split = line.lstrip().split()
+            text = file.read()
+
+        # gather the table columns in one pass, so that colors can be converted at once
+        indices = []
+        names = []
+        colors = []
+        for line in text.splitlines():
+            split = line.split()
             if split and not split[0].startswith('#'):
                 index, name = split[:2]
-                if len(split) >= 5:
-                    color = np.asarray(list(map(int, split[2:6])), dtype=np.float64)
-                    color[3] = (255 - color[3]) / 255  # invert alpha value
-                else:
-                    color = None
-                labels[int(index)] = (name, color)
-        return labels
+                indices.append(int(index))
+                names.append(name)
+                # missing color components default to black and a zero (opaque) alpha
+                rgba = split[2:6]
+                colors.append(rgba + ['0'] * (4 - len(rgba)) if len(rgba) >= 3 else ('0', '0', '0', '0'))
+
+        colors = np.array(colors, dtype=np.int64).astype(np.float64).reshape(-1, 4)
+        colors[:, 3] = (255 - colors[:, 3]) / 255  # invert alpha value
+        return lookup_from_table(indices, names, colors)
 
     def save(self, labels, filename):
         """
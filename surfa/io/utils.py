@@ -1,5 +1,9 @@
+import io
 import os
+import gzip
 import pathlib
+import functools
+import importlib
 import numpy as np
 
 from surfa import ImageGeometry
@@ -27,6 +31,107 @@ def check_file_readability(filename):
         raise PermissionError(f'{filename} is not a readable file')
 
 
+# gzip implementations, along with the file modes they support
+gzip_backends = {
+    'isal': ('isal.igzip', 'rw'),
+    'mgzip': ('mgzip', 'rw'),
+    'rapidgzip': ('rapidgzip', 'r'),
+    'gzip': ('gzip', 'rw'),
+}
+
+# gzip implementations tried (in order of preference) when none is requested
+default_gzip_backends = {
+    'r': ('isal', 'gzip'),
+    'w': ('isal', 'mgzip', 'gzip'),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def find_gzip_backend(requested, mode):
+    """
+    Resolve the gzip implementation used to read or write compressed files.
+
+    Parameters
+    ----------
+    requested : str or None
+        Name of the requested backend. If None, the first installed backend in
+        `default_gzip_backends` is used, falling back to the standard library.
+    mode : str
+        Either 'r' or 'w'.
+
+    Returns
+    -------
+    module
+        Gzip implementation module.
+    """
+    if requested is None:
+        for name in default_gzip_backends[mode]:
+            try:
+                return importlib.import_module(gzip_backends[name][0])
+            except ImportError:
+                continue
+
+    backend = gzip_backends.get(requested.lower())
+    if backend is None:
+        raise ValueError(f'unknown gzip backend \'{requested}\', expected one of: '
+                         f'{", ".join(gzip_backends)}')
+
+    module, modes = backend
+    if mode not in modes:
+        # read-only backends fall back to the default when writing
+        return find_gzip_backend(None, mode)
+
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f'the `{requested.lower()}` python package must be installed for '
+                          'the requested gzip backend')
+
+
+def open_gzip(filename, mode='rb', compresslevel=6, buffer_size=262144):
+    """
+    Open a gzip-compressed file. The fastest available implementation is used, which
+    can be overridden by setting the `SURFA_GZIP_BACKEND` environment variable to
+    `isal`, `mgzip`, `rapidgzip` (reading only), or `gzip`.
+
+    Parameters
+    ----------
+    filename : str or Path
+        File path to open.
+    mode : str
+        Binary read or write mode.
+    compresslevel : int
+        Compression level when writing. The `isal` backend supports a maximum
+        level of 3, to which higher levels are clipped.
+    buffer_size : int
+        Size in bytes of the read or write buffer wrapping the compressed stream.
+
+    Returns
+    -------
+    file object
+        Opened gzip file.
+    """
+    write = mode[0] in 'wax'
+    backend = find_gzip_backend(os.environ.get('SURFA_GZIP_BACKEND'), 'w' if write else 'r')
+
+    if backend.__name__ == 'rapidgzip':
+        file = backend.open(filename, parallelization=0)
+    elif backend.__name__ == 'mgzip':
+        # compress independent 4 MiB blocks (as concatenated gzip members) on all cores
+        file = backend.open(filename, mode, compresslevel=compresslevel, thread=0, blocksize=4194304)
+    elif write:
+        if backend.__name__ == 'isal.igzip':
+            compresslevel = min(compresslevel, 3)
+        file = backend.open(filename, mode, compresslevel=compresslevel)
+    else:
+        file = backend.open(filename, mode)
+
+    # file headers are usually read and written as many small fields, so wrap the
+    # stream in a large buffer to limit the calls into the (de)compressor
+    buffered = io.BufferedWriter if write else io.BufferedReader
+    return buffered(file, buffer_size=buffer_size)
+
+
 def read_int(file, size=4, signed=True, byteorder='big'):
     """
     Read integer from a file buffer.
@@ -92,6 +197,39 @@ def read_bytes(file, dtype, count=1):
     return value
 
 
+def read_array(file, dtype, shape, order='C'):
+    """
+    Read an array from a binary file buffer directly into preallocated memory,
+    without building an intermediate bytes object.
+
+    Parameters
+    ----------
+    file : BufferedReader
+        Opened file buffer.
+    dtype : np.dtype
+        Read into numpy datatype.
+    shape : tuple of int
+        Array shape.
+    order : str
+        Memory order of the stored array elements.
+
+    Returns
+    -------
+    np.ndarray:
+        The read array.
+    """
+    shape = tuple(int(x) for x in shape)
+    data = np.empty(int(np.prod(shape)), dtype=dtype)
+    view = memoryview(data).cast('B')
+    nbytes = 0
+    while nbytes < view.nbytes:
+        count = file.readinto(view[nbytes:])
+        if not count:
+            raise ValueError(f'file ended after {nbytes} of {view.nbytes} expected array bytes')
+        nbytes += count
+    return data.reshape(shape, order=order)
+
+
 def write_bytes(file, value, dtype):
     """
     Write a binary file buffer.
@@ -108,6 +246,38 @@ def write_bytes(file, value, dtype):
     file.write(np.asarray(value).astype(dtype, copy=False).tobytes())
 
 
+def write_array(file, value, dtype, order='C'):
+    """
+    Write an array to a binary file buffer in a particular element order. Unless the
+    array memory already matches the target layout and datatype, it is converted and
+    written one slab (along the slowest-varying axis) at a time, so that a full copy
+    of the array is never allocated.
+
+    Parameters
+    ----------
+    file : BufferedWriter
+        Opened file buffer.
+    value : array_like
+        Array to write.
+    dtype : np.dtype
+        Datatype to save as.
+    order : str
+        Element order to write in.
+    """
+    value = np.asarray(value)
+    dtype = np.dtype(dtype)
+
+    # the fortran-ordered elements of an array are the c-ordered elements of its transpose
+    if order == 'F':
+        value = value.T
+
+    if value.ndim < 2 or (value.dtype == dtype and value.flags.c_contiguous):
+        file.write(np.ascontiguousarray(value, dtype=dtype))
+    else:
+        for slab in value:
+            file.write(np.ascontiguousarray(slab, dtype=dtype))
+
+
 def read_geom(file, niftiheaderext=False, shearless=True):
     """
     Read an image geometry from a binary file buffer. See VOL_GEOM.read() in mri.h.
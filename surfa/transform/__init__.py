@@ -12,4 +12,11 @@ from .geometry import ImageGeometry
 from .geometry import cast_image_geometry
 from .geometry import image_geometry_equal
 
-from .warp import Warp
+
+def __getattr__(name):
+    # warp depends on surfa.image, which itself imports this package, so it's
+    # loaded on first access to avoid a circular import
+    if name == 'Warp':
+        from .warp import Warp
+        return Warp
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
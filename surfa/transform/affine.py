@@ -354,31 +354,30 @@ class Affine:
             raise RuntimeError('original coordinate space, source, and target '
                                'information must be defined for affine conversion')
 
+        # the conversions are chained on the raw matrices, so that intermediate
+        # affine objects are not constructed for every product
         if same_source and same_target:
             # just a simple conversion of transform coordinate space, without
             # changing source and target information
             a = self.target.affine(self.space, space)
             b = self.source.affine(space, self.space)
-            affine = a @ self @ b
+            matrix = np.linalg.multi_dot([a.matrix, self.matrix, b.matrix])
         else:
             # if source and target info is changing, we need to recompute the
             # transform by first converting it to universal world-space
             if self.space == 'world':
-                affine = self.copy()
+                matrix = self.matrix
             else:
                 a = self.target.affine(self.space, 'world')
                 b = self.source.affine('world', self.space)
-                affine = a @ self @ b
+                matrix = np.linalg.multi_dot([a.matrix, self.matrix, b.matrix])
             # now convert into the desired coordinate space
             if space != 'world':
                 a = target.affine('world', space)
                 b = source.affine(space, 'world')
-                affine = a @ affine @ b
+                matrix = np.linalg.multi_dot([a.matrix, matrix, b.matrix])
 
-        # the matrix multiplication above should propogate space and geometry info
-        # correctly, but in a few cases, the matmul is skipped, so let's just return
-        # a new affine object with the correct information
-        return Affine(affine.matrix, source=source, target=target, space=space)
+        return Affine(matrix, source=source, target=target, space=space)
 
     # the implementation is based on FramedImage.transform
     def __transform_image(self, image, method='linear', rotation='corner', resample=True, fill=0):
@@ -398,7 +397,8 @@ class Affine:
         if image.basedim == 2:
             raise NotImplementedError('Affine.transform() is not yet implemented for 2D data')
 
-        affine = self.copy()
+        # the affine is never modified in place below, so it doesn't need to be copied
+        affine = self
 
         # if not resampling, just change the image vox2world matrix and return
         if not resample:
@@ -446,7 +446,7 @@ class Affine:
 
         # make sure the matrix is actually inverted since we want a target to
         # source voxel mapping for resampling
-        matrix_data = affine.inv().matrix
+        matrix_data = np.linalg.inv(affine.matrix)
         source_data = image.framed_data
 
         # do the interpolation
@@ -565,7 +565,8 @@ def cast_affine(obj, allow_none=True, copy=False):
         return obj.copy() if copy else obj
 
     if getattr(obj, '__array__', None) is not None:
-        return Affine(np.array(obj))
+        # the matrix setter always copies into a new square array
+        return Affine(np.asarray(obj))
 
     raise ValueError('cannot convert type %s to affine' % type(obj).__name__)
 
@@ -850,7 +851,12 @@ def center_to_corner_rotation(affine, image_shape):
     Affine
         Converted affine matrix with corner rotation.
     """
-    center = identity()
-    center[:3, -1] = -0.5 * (np.asarray(image_shape[:affine.ndim]) - 1)
-    shifted = center.inv() @ (affine @ center)
+    # compose the translations with the raw matrix, since the inverse of a translation
+    # is just its negation
+    shift = -0.5 * (np.asarray(image_shape[:affine.ndim]) - 1)
+    center = np.eye(affine.ndim + 1)
+    center[:-1, -1] = shift
+    uncenter = np.eye(affine.ndim + 1)
+    uncenter[:-1, -1] = -shift
+    shifted = np.linalg.multi_dot([uncenter, affine.matrix, center])
     return affine.new(shifted)
@@ -1,6 +1,5 @@
 import warnings
 import numpy as np
-from copy import deepcopy
 
 from surfa.core.array import pad_vector_length
 from surfa.core.array import check_array
@@ -150,8 +149,9 @@ class ImageGeometry:
             if shear is not None:
                 raise ValueError('shear and vox2world matrix cannot both be specified when computing geometry')
 
-            # compute scale, rotation, center, and shear
-            vox2world = cast_affine(vox2world)
+            # compute scale, rotation, center, and shear. an input affine is copied since the
+            # geometry stores it as read-only, but array input is already copied by the cast
+            vox2world = vox2world.copy() if isinstance(vox2world, Affine) else cast_affine(vox2world)
             scale, rotation, center, shear = decompose_centered_affine(self.shape, vox2world)
 
             # if voxsize is not provided, use the computed scale from the affine, but if voxsize has
@@ -165,7 +165,7 @@ class ImageGeometry:
         if vox2world is None:
             self._vox2world = compose_centered_affine(self.shape, voxsize, rotation, center, shear)
         else:
-            self._vox2world = vox2world.copy()
+            self._vox2world = vox2world
 
         # set the internal parameters
         self._voxsize = voxsize
@@ -222,8 +222,15 @@ class ImageGeometry:
     def copy(self):
         """
         Create a copy of the image geometry.
+
+        Since the internal parameter arrays and affines are read-only, and are always
+        replaced (never modified) on update, they can be shared with the copy instead
+        of being deep-copied.
         """
-        return deepcopy(self)
+        copied = self.__class__.__new__(self.__class__)
+        copied.__dict__.update(self.__dict__)
+        copied._affines = dict(self._affines)
+        return copied
 
     @property
     def shape(self):
@@ -1,3 +1,4 @@
+import functools
 import numpy as np
 
 
@@ -43,13 +44,23 @@ def orientation_to_rotation_matrix(orientation):
     np.ndarray
         4x4 direction cosine matrix.
     """
-    orientation = orientation.upper()
+    # there are only 48 valid orientations, so the matrices are built once and copied
+    return cached_rotation_matrix(orientation.upper()).copy()
+
+
+@functools.lru_cache(maxsize=None)
+def cached_rotation_matrix(orientation):
+    """
+    Build the (read-only) direction cosine matrix of an uppercase orientation string.
+    Use `orientation_to_rotation_matrix()` instead of calling this directly.
+    """
     check_orientation(orientation)
 
     matrix = np.zeros((3, 3))
     for i, c in enumerate(orientation):
         matrix[:3, i] -= [c == x for x in 'LPI']
         matrix[:3, i] += [c == x for x in 'RAS']
+    matrix.setflags(write=False)
     return matrix
 
 
@@ -58,7 +58,7 @@ class Warp(FramedImage):
             raise ValueError(f'invalid shape {data.shape} for {basedim}D warp')
 
         super().__init__(basedim, data, geometry=target, **kwargs)
-        self.metadata['intent'] = sf.core.framed.FramedArrayIntents.warpmap
+        self._metadata['intent'] = sf.core.framed.FramedArrayIntents.warpmap
 
     def __call__(self, *args, **kwargs):
         """
@@ -81,7 +81,7 @@ class Warp(FramedImage):
         if format is None:
             format = self.format
 
-        return self.__class__(data, source, target, format=format, metadata=self.metadata)
+        return self.share_metadata(self.__class__(data, source, target, format=format))
 
     def save(self, filename, fmt=None):
         """
@@ -37,6 +37,70 @@ def test_data_management():
     assert fac.data is fa.data
 
 
+def test_metadata_management():
+    """
+    Test that metadata is copied on assignment and that copied arrays don't
+    share any mutable state with the source.
+    """
+    lookup = sf.LabelLookup()
+    lookup[1] = ('label', [255, 0, 0])
+    fa = sf.Volume(np.random.rand(8, 8, 8), metadata={'history': ['cmd'], 'labels': lookup})
+    assert fa.labels is not lookup
+
+    fac = fa.copy()
+    fac.metadata['history'].append('other')
+    fac.labels[1].name = 'renamed'
+    assert fa.metadata['history'] == ['cmd']
+    assert fa.labels[1].name == 'label'
+
+    # derived arrays share metadata until either side modifies it
+    fb = sf.Volume(np.random.rand(8, 8, 8), metadata={'history': ['cmd'], 'labels': lookup})
+    fbn = fb + 1
+    assert fbn._metadata is fb._metadata
+    fbn.metadata['history'].append('other')
+    fbn.labels[1].name = 'renamed'
+    assert fb.metadata['history'] == ['cmd']
+    assert fb.labels[1].name == 'label'
+
+    # metadata retrieved before deriving an array must not leak into it
+    meta = fa.metadata
+    labels = fa.labels
+    fan = fa + 1
+    meta['history'].append('other')
+    meta['key'] = 1
+    labels[1].name = 'renamed'
+    assert fan.metadata['history'] == ['cmd']
+    assert 'key' not in fan.metadata
+    assert fan.labels[1].name == 'label'
+
+
+def test_loaded_metadata_sharing(tmp_path):
+    """
+    Test that arrays loaded from (or saved to) disk still share metadata with
+    derived arrays, since io only accesses the metadata internally.
+    """
+    lookup = sf.LabelLookup()
+    lookup[1] = ('label', [255, 0, 0])
+    seg = sf.Volume(np.random.randint(0, 2, (8, 8, 8)).astype(np.int32), labels=lookup)
+    seg.metadata['history'] = ['cmd']
+    for ext in ('mgz', 'nii.gz'):
+        filename = tmp_path / f'seg.{ext}'
+        seg.save(filename)
+        loaded = sf.load_volume(filename)
+        derived = loaded + 1
+        assert derived._metadata is loaded._metadata
+        derived.labels[1].name = 'renamed'
+        assert loaded.labels[1].name == 'label'
+
+    # saving does not expose the metadata either
+    saved = sf.Volume(np.zeros((4, 4, 4)), metadata={'history': ['cmd']})
+    saved.save(tmp_path / 'saved.mgz')
+    assert (saved + 1)._metadata is saved._metadata
+
+    warp = sf.Warp(np.zeros((4, 4, 4, 3)))
+    assert warp.new(warp.data)._metadata is warp._metadata
+
+
 def test_data_shapes():
     """
     Test ndarray inputs and shape management for framed arrays. Pretty low-level stuff
@@ -222,14 +286,15 @@ def test_data_functions():
         assert np.array_equal(fa.round(), np.round(fa.data))
         assert np.array_equal(fa.clip(0.4, 0.6), np.clip(fa.data, 0.4, 0.6))
         assert np.array_equal(fa.zeros(), np.zeros(fa.shape, dtype=fa.dtype))
+        assert np.array_equal(fa.zeros(fill=2), np.full(fa.shape, 2, dtype=fa.dtype))
+        assert fa.zeros(fill=None, frames=3).shape == (*baseshape, 3)
 
-        # TODO: update for newer numpy - seems to be throwing warnings
         p = [0.2, 0.4, 0.6, 0.8]
         for method in ('linear', 'midpoint'):
             assert np.array_equal(fa.percentile(p, method=method),
-                                  np.percentile(fa.data, p, interpolation=method))
+                                  np.percentile(fa.data, p, method=method))
             assert np.array_equal(fa.percentile(p, method=method, nonzero=True),
-                                  np.percentile(fa.data[fa.data != 0], p, interpolation=method))
+                                  np.percentile(fa.data[fa.data != 0], p, method=method))
 
         # make sure the original array hasn't changes
         assert np.array_equal(backup.data, fa.data)
@@ -264,3 +329,135 @@ def test_label_encoding():
         b = a.collapse(unique)
 
         assert np.array_equal(seg.data, b.data)
+        assert b.dtype == np.uint8
+
+        # output types without a typed kernel
+        for dtype in (np.float16, '>f4'):
+            c = seg.onehot(unique, dtype=dtype)
+            assert c.dtype == dtype
+            assert np.array_equal(c.data, a.data)
+
+
+def test_framed_data_view():
+    """
+    Test that the framed data remains a view of the data after copying and pickling.
+    """
+    import pickle
+    vol = sf.Volume(np.random.rand(8, 8, 8))
+    for arr in (vol.copy(), pickle.loads(pickle.dumps(vol))):
+        arr.data[1, 2, 3] = -1
+        assert arr.framed_data[1, 2, 3, 0] == -1
+        assert np.shares_memory(arr.framed_data, arr.data)
+
+
+def test_memory_order():
+    """
+    Test that operators preserve the memory order of the source data.
+    """
+    na = np.random.rand(16, 16, 16)
+    fa = sf.Volume(np.asfortranarray(na))
+    nc = np.ascontiguousarray(na)
+    assert (fa + 1).data.flags.f_contiguous
+    assert (fa * nc).data.flags.f_contiguous
+    assert (-fa).data.flags.f_contiguous
+    assert (fa > 0.5).data.flags.f_contiguous
+    assert (fa == 0.5).data.flags.f_contiguous
+    assert (sf.Volume(nc) + np.asfortranarray(na)).data.flags.c_contiguous
+
+
+def test_incompatible_equality():
+    """
+    Test that comparing with an incompatible type is elementwise unequal, like numpy.
+    """
+    fa = sf.Volume(np.random.rand(4, 4, 4))
+    assert not np.any(fa == 'a')
+    assert np.all(fa != 'a')
+
+
+def test_compare_buffer():
+    """
+    Test comparisons written into a preallocated output buffer.
+    """
+    na = np.random.rand(16, 16, 16)
+    fa = sf.Volume(na)
+    out = np.zeros(na.shape, dtype=bool)
+    x = na[0, 0, 0]
+    for op, expected in (('>', na > x), ('<=', na <= x), ('==', na == x)):
+        result = fa.compare(op, x, out=out)
+        assert np.shares_memory(result.data, out)
+        assert np.array_equal(result, expected)
+    with pytest.raises(ValueError):
+        fa.compare('<>', 0.5)
+
+
+def test_image_indexing():
+    """
+    Test that image index expressions are expanded to every dimension, with or
+    without an ellipsis.
+    """
+    vol = sf.Volume(np.random.rand(8, 9, 10, 2))
+    assert vol[1:4].shape == (3, 9, 10, 2)
+    assert vol[..., 2:5, :].shape == (8, 9, 3, 2)
+    assert np.array_equal(vol[1:4, ..., 1].data, vol.data[1:4, ..., 1])
+
+    with pytest.raises(IndexError):
+        vol[..., 0, ...]
+
+
+def test_image_conform():
+    """
+    Test that conforming with a single (fused) resampling matches reorienting, resizing,
+    and reshaping in sequence, including voxels at the edges of the image.
+    """
+    rotation = sf.transform.orientation.orientation_to_rotation_matrix('LIA')
+    geometry = sf.ImageGeometry((21, 18, 16), voxsize=(1, 1.2, 0.9), rotation=rotation)
+    data = np.random.rand(21, 18, 16) * 100
+    for method, dtype in (('linear', np.float32), ('nearest', np.uint8)):
+        vol = sf.Volume(data.astype(dtype), geometry=geometry)
+        for orientation in ('RAS', None):
+            # both cropped and padded along different axes
+            conformed = vol.conform(orientation=orientation, voxsize=1.5, shape=(10, 8, 15), method=method)
+            sequential = vol.reorient(orientation) if orientation is not None else vol
+            sequential = sequential.resize(1.5, method=method).reshape((10, 8, 15))
+            assert conformed.shape == sequential.shape
+            assert np.allclose(conformed.geom.vox2world.matrix, sequential.geom.vox2world.matrix)
+            assert np.array_equal(conformed.data, sequential.data)
+
+
+def test_image_resize_nearest():
+    """
+    Test that integer nearest-neighbor downsampling matches interpolation.
+    """
+    from surfa.image.interp import interpolate
+    vol = sf.Volume(np.random.randint(0, 100, (16, 12, 8), dtype=np.uint8))
+    for voxsize in (2, (1, 2, 4), 3):
+        resized = vol.resize(voxsize, method='nearest')
+        affine = np.matmul(vol.geom.world2vox.matrix, resized.geom.vox2world.matrix)
+        expected = interpolate(vol.framed_data, resized.geom.shape, 'nearest', affine)
+        assert resized.dtype == expected.dtype
+        assert np.array_equal(resized.framed_data, expected)
+
+
+def test_mgh_io(tmp_path):
+    """
+    Test MGH and MGZ round trips, optionally skipping the trailing metadata.
+    """
+    geometry = sf.ImageGeometry((9, 7, 5), voxsize=(1, 1.5, 2), rotation='RAS', center=(1, 2, 3))
+    vol = sf.Volume(np.random.rand(9, 7, 5, 2).astype(np.float32)[::-1], geometry=geometry)
+    vol.metadata['history'] = ['command']
+    for ext in ('mgh', 'mgz'):
+        filename = tmp_path / f'vol.{ext}'
+        vol.save(filename)
+        for metadata in (True, False):
+            loaded = sf.load_volume(filename, metadata=metadata)
+            assert np.array_equal(loaded.data, vol.data)
+            assert np.allclose(loaded.geom.vox2world.matrix, vol.geom.vox2world.matrix, atol=1e-5)
+            assert loaded.metadata.get('history') == (['command'] if metadata else None)
+
+
+def test_image_resize_nearest_order():
+    """
+    Test that integer nearest-neighbor downsampling preserves the memory layout.
+    """
+    vol = sf.Volume(np.asfortranarray(np.random.randint(0, 100, (16, 12, 8), dtype=np.uint8)))
+    assert vol.resize(2, method='nearest').data.flags.f_contiguous
@@ -0,0 +1,30 @@
+import surfa as sf
+
+
+def test_nonlateral_aseg_recoder(tmp_path, monkeypatch):
+    """
+    Test that left and right aseg labels are merged into the same nonlateral targets,
+    including both choroid plexus labels.
+    """
+    lut = tmp_path / 'FreeSurferColorLUT.txt'
+    lut.write_text('\n'.join([
+        '0    Unknown                      0   0   0 0',
+        '2    Left-Cerebral-White-Matter 245 245 245 0',
+        '4    Left-Lateral-Ventricle     120  18 134 0',
+        '31   Left-Choroid-Plexus          0 200 200 0',
+        '41   Right-Cerebral-White-Matter  0 225   0 0',
+        '63   Right-Choroid-Plexus         0 200 221 0',
+        '77   WM-hypointensities         200  70 255 0',
+        '1001 ctx-lh-bankssts             25 100  40 0',
+    ]) + '\n')
+    monkeypatch.setenv('FREESURFER_HOME', str(tmp_path))
+    sf.freesurfer.invalidate_caches()
+
+    recoder = sf.freesurfer.nonlateral_aseg_recoder()
+    target = {elt.name: idx for idx, elt in recoder.target.items()}
+
+    assert recoder.mapping[31] == recoder.mapping[63] == target['Left-Choroid-Plexus']
+    assert recoder.mapping[2] == recoder.mapping[41] == target['Left-Cerebral-White-Matter']
+    assert recoder.mapping[4] == target['CSF']
+    assert recoder.mapping[77] == target['Left-Lesion']
+    assert recoder.mapping[1001] == target['Left-Cerebral-Cortex']
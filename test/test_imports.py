@@ -0,0 +1,11 @@
+import surfa as sf
+
+
+def test_star_import():
+    """
+    Test that a star import exports the lazily-loaded surfa names.
+    """
+    namespace = {}
+    exec('from surfa import *', namespace)
+    for name in ('Volume', 'Affine', 'ImageGeometry', 'LabelLookup', 'load_volume', 'io', 'labels'):
+        assert namespace[name] is getattr(sf, name)
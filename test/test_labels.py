@@ -0,0 +1,101 @@
+import pytest
+import numpy as np
+import surfa as sf
+
+
+def test_overlap_scores():
+    """
+    Test dice and jaccard scores against a direct per-label computation, for both
+    histogrammable and arbitrary label values.
+    """
+    a = np.random.randint(0, 8, size=(16, 16, 16))
+    b = np.random.randint(0, 8, size=(16, 16, 16))
+
+    for dtype in (np.uint8, np.int32, np.float32):
+        for offset in (0, -4):
+            x = (a + offset).astype(dtype)
+            y = (b + offset).astype(dtype)
+            labels = [l for l in np.unique(x) if l != 0] + [100]
+
+            dice = sf.labels.dice(x, y, labels)
+            jaccard = sf.labels.jaccard(x, y, labels)
+            assert 100 not in dice and 100 not in jaccard
+
+            for l in labels[:-1]:
+                inter = np.sum((x == l) & (y == l))
+                assert np.isclose(dice[l], 2 * inter / (np.sum(x == l) + np.sum(y == l)))
+                assert np.isclose(jaccard[l], inter / np.sum((x == l) | (y == l)))
+
+    # sparse, very large label values must not be histogrammed directly
+    x = np.where(a > 3, 4_000_000_000, a).astype(np.uint32)
+    y = np.where(b > 3, 4_000_000_000, b).astype(np.uint32)
+    dice = sf.labels.dice(x, y)
+    for l in (1, 2, 3, 4_000_000_000):
+        inter = np.sum((x == l) & (y == l))
+        assert np.isclose(dice[l], 2 * inter / (np.sum(x == l) + np.sum(y == l)))
+
+
+def test_recode():
+    """
+    Test label recoding, including labels missing from the mapping.
+    """
+    seg = np.random.randint(0, 20, size=(16, 16, 16)).astype(np.int16)
+    mapping = {l: l * 100 for l in range(0, 20, 2)}
+    expected = np.vectorize(lambda l: mapping.get(l, 0))(seg)
+
+    recoded = sf.labels.recode(sf.Volume(np.asfortranarray(seg)), mapping)
+    assert isinstance(recoded, sf.Volume)
+    assert np.array_equal(recoded.data, expected)
+    assert recoded.dtype == np.uint16
+
+    out = np.empty(seg.shape, dtype=np.int32)
+    assert sf.labels.recode(seg, mapping, out=out) is out
+    assert np.array_equal(out, expected)
+
+    # sparse and negative labels are recoded without a dense lookup table
+    sparse = {2**40: 1, -3: 2, 4: 3}
+    seg = np.array([2**40, -3, 4, 5, 0], dtype=np.int64)
+    recoder = sf.LabelRecoder(sparse)
+    assert np.array_equal(recoder(seg), [1, 2, 3, 0, 0])
+    assert recoder.lookup_table() is None
+
+
+def test_recoder_inversion():
+    """
+    Test that many-to-1 recoders invert to the smallest source label.
+    """
+    recoder = sf.LabelRecoder({4: 1, 2: 0, 3: 1, 1: 0})
+    with pytest.warns(UserWarning):
+        inverted = recoder.invert()
+    assert list(inverted.mapping.items()) == [(1, 3), (0, 1)]
+
+    with pytest.raises(KeyError):
+        recoder.invert(strict=True)
+
+    # inverting never builds the lookup table, which can't exist for sparse labels
+    recoder = sf.LabelRecoder({2**40: 1})
+    assert recoder.invert().mapping == {1: 2**40}
+    assert not recoder._lut_compiled
+
+    # non-integer labels are inverted without being truncated
+    assert sf.LabelRecoder({1: 1.5, 2: 2.5}).invert().mapping == {1.5: 1, 2.5: 2}
+    assert sf.LabelRecoder({'a': 1, 'b': 2}).invert().mapping == {1: 'a', 2: 'b'}
+
+
+def test_label_lookup_elements():
+    """
+    Test conversion of values assigned to a label lookup.
+    """
+    lookup = sf.LabelLookup()
+    lookup[1] = 'name-only'
+    lookup[2] = ('clipped', [300, -4, 12.7])
+    assert np.array_equal(lookup[1].color, [0, 0, 0, 1])
+    assert np.array_equal(lookup[2].color, [255, 0, 12, 1])
+    assert lookup.search('ONLY') == [1]
+
+    with pytest.raises(ValueError):
+        lookup[3] = ('name', [0, 0, 0], 'extra')
+
+    table = sf.labels.lookup_from_table([2, 1], ['clipped', 'name-only'], [[300, -4, 12.7], [0, 0, 0]])
+    assert list(table.keys()) == [2, 1]
+    assert np.array_equal(table.colors, [[255, 0, 12, 1], [0, 0, 0, 1]])